@@ -0,0 +1,172 @@
+# Throughput benchmark suite for the Lab1 classical ciphers.
+#
+# Each cipher runs on inputs from 1 KB to 100 MB: warmup runs first, then
+# repeated timed samples (median per-call time reported as chars/s), then one
+# extra run under tracemalloc for peak memory. Small inputs take microseconds
+# per call, so each sample repeats the call until it lasts MIN_SAMPLE_S and
+# is divided by the number of calls. Results can be written as JSON and compared
+# against an earlier run to catch regressions.
+#
+# Usage:
+#   python benchmark_suite.py --json results.json
+#   python benchmark_suite.py --max-size 1MB --compare results.json
+
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import string
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from q1 import additive_cipher, affine_cipher
+from q2 import autokey_decrypt, vigenere_encrypt
+from q3 import playfair_encrypt
+from q4 import hill_encrypt
+
+MIN_SAMPLE_S = 0.02  # fast calls are repeated to fill a sample
+
+SIZES = {"1KB": 1 << 10, "10KB": 10 << 10, "100KB": 100 << 10,
+         "1MB": 1 << 20, "10MB": 10 << 20, "100MB": 100 << 20}
+
+CIPHERS = {
+    "additive_cipher": lambda text: additive_cipher(text, 3),
+    "affine_cipher": lambda text: affine_cipher(text, 5, 8),
+    "vigenere_encrypt": lambda text: vigenere_encrypt(text, "DOLLARS"),
+    "autokey_decrypt": lambda text: autokey_decrypt(text, 7),
+    "playfair_encrypt": lambda text: playfair_encrypt("GUIDANCE", text),
+    "hill_encrypt": lambda text: hill_encrypt(text, [[3, 3], [2, 7]]),
+}
+
+
+def make_input(size, seed=0):
+    """Reproducible uppercase letters (valid input for every cipher)"""
+    rng = random.Random(seed)
+    block = ''.join(rng.choices(string.ascii_uppercase, k=min(size, 1 << 16)))
+    return (block * (size // len(block) + 1))[:size]
+
+
+def measure(func, text, warmup, repeats):
+    """Per-call times of func(text) over `repeats` samples, plus peak memory"""
+    for _ in range(warmup):
+        func(text)
+    # Grow the calls per sample until one sample lasts MIN_SAMPLE_S (as timeit.autorange)
+    # and keep the collector out of the timed loops, as timeit does
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                func(text)
+            elapsed = time.perf_counter() - start
+            if elapsed >= MIN_SAMPLE_S:
+                break
+            number = max(number * 2, int(number * MIN_SAMPLE_S / max(elapsed, 1e-9) * 1.1))
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(number):
+                func(text)
+            times.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    func(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = statistics.median(times)
+    return {
+        "chars": len(text),
+        "median_s": median,
+        "min_s": min(times),
+        "chars_per_s": len(text) / median if median else float('inf'),
+        "best_chars_per_s": len(text) / min(times) if min(times) else float('inf'),
+        "calls_per_sample": number,
+        "peak_bytes": peak,
+    }
+
+
+def run(sizes, ciphers, warmup=1, repeats=5):
+    results = {}
+    for size_name in sizes:
+        text = make_input(SIZES[size_name])
+        for name in ciphers:
+            # Fewer repeats for the big inputs keeps a full run in minutes
+            reps = repeats if SIZES[size_name] <= SIZES["1MB"] else max(1, repeats // 2)
+            r = measure(CIPHERS[name], text, warmup, reps)
+            results.setdefault(name, {})[size_name] = r
+            print(f"{name:<18} {size_name:>6}: {r['chars_per_s'] / 1e6:9.2f} M chars/s  "
+                  f"median {r['median_s']:.4f}s  peak {r['peak_bytes'] / 2**20:8.2f} MB")
+    return results
+
+
+def compare(results, baseline, threshold=0.10):
+    """Print speed ratios against a baseline JSON; returns the regressions.
+
+    Ratios use the fastest sample of each run: other load on the machine only
+    ever slows a sample down, so the best time is the most repeatable.
+    """
+    regressions = []
+    for name, by_size in results.items():
+        for size_name, r in by_size.items():
+            old = baseline.get("results", {}).get(name, {}).get(size_name)
+            if not old:
+                continue
+            key = "best_chars_per_s" if "best_chars_per_s" in old else "chars_per_s"
+            ratio = r[key] / old[key]
+            flag = "REGRESSION" if ratio < 1 - threshold else ""
+            print(f"{name:<18} {size_name:>6}: {ratio:6.2f}x {flag}")
+            if flag:
+                regressions.append((name, size_name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Lab1 classical ciphers")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--max-size", choices=list(SIZES))
+    parser.add_argument("--ciphers", nargs="+", choices=list(CIPHERS), default=list(CIPHERS))
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes
+    if args.max_size:
+        sizes = [s for s in sizes if SIZES[s] <= SIZES[args.max_size]]
+
+    results = run(sizes, args.ciphers, args.warmup, args.repeats)
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "warmup": args.warmup,
+        "repeats": args.repeats,
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\nResults written to {args.json}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.compare} ({baseline.get('timestamp')}):")
+        if compare(results, baseline):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# Ciphertext-only attack on shift and affine ciphers (see q5.py / q6.py for the
+# known-plaintext versions). Every candidate key is scored with a chi-squared
+# statistic against English letter frequencies; all keys for all messages are
+# scored together with one matrix product.
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from math import gcd
+
+import numpy as np
+
+from q1 import additive_cipher, affine_cipher
+
+# English letter frequencies A-Z (percent)
+ENGLISH_FREQ = np.array([
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153,
+    0.772, 4.025, 2.406, 6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056,
+    2.758, 0.978, 2.360, 0.150, 1.974, 0.074])
+ENGLISH_FREQ /= ENGLISH_FREQ.sum()
+
+SHIFT_KEYS = [(1, b) for b in range(26)]
+AFFINE_KEYS = [(a, b) for a in range(1, 26) if gcd(a, 26) == 1 for b in range(26)]  # 312 keys
+
+
+def letter_counts(messages):
+    """(len(messages), 26) matrix of A-Z counts, built with one bincount"""
+    arrays = []
+    for msg in messages:
+        arr = np.frombuffer(msg.upper().encode('ascii', 'ignore'), dtype=np.uint8)
+        arrays.append(arr[(arr >= 65) & (arr <= 90)])
+    lengths = np.array([len(arr) for arr in arrays], dtype=np.int64)
+    letters = np.concatenate(arrays).astype(np.int64) - 65 if arrays else np.empty(0, np.int64)
+    owner = np.repeat(np.arange(len(arrays)), lengths)
+    return np.bincount(owner * 26 + letters, minlength=len(arrays) * 26).reshape(-1, 26)
+
+
+@lru_cache(maxsize=None)
+def key_weights(affine=False):
+    """(26, n_keys) matrix W with W[y, k] = 1 / f(x) where key k encrypts x to y.
+
+    For counts O of a message with N letters, the chi-squared statistic of the
+    decryption under key k is sum_x (O[E_k(x)] - N f(x))^2 / (N f(x))
+    = (O^2 @ W)[k] / N - N.
+    """
+    keys = AFFINE_KEYS if affine else SHIFT_KEYS
+    weights = np.zeros((26, len(keys)))
+    x = np.arange(26)
+    for k, (a, b) in enumerate(keys):
+        weights[(a * x + b) % 26, k] = 1 / ENGLISH_FREQ
+    return weights
+
+
+def score_keys(counts, affine=False):
+    """Chi-squared score of every key for every message (lower is better)"""
+    counts = np.asarray(counts, dtype=np.float64)
+    totals = counts.sum(axis=1, keepdims=True)
+    return (counts ** 2) @ key_weights(affine) / np.maximum(totals, 1) - totals
+
+
+def rank_keys(messages, affine=False, top=5):
+    """Best `top` keys per message as [(key, chi2), ...]; key is the shift or (a, b)"""
+    keys = AFFINE_KEYS if affine else SHIFT_KEYS
+    scores = score_keys(letter_counts(messages), affine)
+    order = np.argsort(scores, axis=1)[:, :top]
+    ranked = []
+    for row, best in zip(scores, order):
+        ranked.append([(keys[k] if affine else keys[k][1], float(row[k])) for k in best])
+    return ranked
+
+
+def decrypt_with(message, key, affine=False):
+    if affine:
+        return affine_cipher(message, key[0], key[1], 'decrypt')
+    return additive_cipher(message, key, 'decrypt')
+
+
+def _crack_chunk(args):
+    messages, affine, top = args
+    return [[(key, score, decrypt_with(msg, key, affine)) for key, score in candidates]
+            for msg, candidates in zip(messages, rank_keys(messages, affine, top))]
+
+
+def crack_batch(messages, affine=False, top=5, workers=None, chunk_size=2000):
+    """Rank candidate keys for many ciphertexts: [[(key, chi2, plaintext), ...], ...].
+
+    With workers > 1 the batch is split into chunks scored in a process pool.
+    """
+    messages = list(messages)
+    chunks = [(messages[i:i + chunk_size], affine, top)
+              for i in range(0, len(messages), chunk_size)]
+    if not workers or workers <= 1:
+        results = map(_crack_chunk, chunks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_crack_chunk, chunks))
+    return [candidates for chunk in results for candidates in chunk]
+
+
+if __name__ == "__main__":
+    sentences = [
+        "the quick brown fox jumps over the lazy dog while the farmer watches",
+        "cryptography is the practice of secure communication in the presence of adversaries",
+        "frequency analysis breaks every monoalphabetic substitution given enough ciphertext",
+    ]
+
+    print("=== Shift cipher ===")
+    ciphertexts = [additive_cipher(s, random.randrange(26)) for s in sentences]
+    for ct, candidates in zip(ciphertexts, crack_batch(ciphertexts, top=3)):
+        print(f"\nCiphertext: {ct}")
+        for key, score, plain in candidates:
+            print(f"  shift={key:2d}  chi2={score:8.2f}  {plain}")
+
+    print("\n=== Affine cipher ===")
+    ciphertexts = [affine_cipher(s, random.choice([5, 7, 11, 17]), random.randrange(26))
+                   for s in sentences]
+    for ct, candidates in zip(ciphertexts, crack_batch(ciphertexts, affine=True, top=3)):
+        print(f"\nCiphertext: {ct}")
+        for key, score, plain in candidates:
+            print(f"  (a, b)={key}  chi2={score:8.2f}  {plain}")
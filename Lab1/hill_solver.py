@@ -0,0 +1,102 @@
+# Known-plaintext attack on the Hill cipher from q4.py.
+# With plaintext blocks P (m x n) and ciphertext blocks C = P K^T (mod 26),
+# any n blocks whose plaintext matrix is invertible mod 26 give the key:
+# K^T = P_S^-1 C_S. Many block selections are inverted at once with batched
+# Gauss-Jordan elimination over GF(2) and GF(13) (Z/26 = Z/2 x Z/13);
+# singular selections are skipped and every candidate key is checked against
+# all known blocks.
+
+import time
+from itertools import combinations, islice
+from math import comb
+
+import numpy as np
+
+from q4 import hill_encrypt, text_to_nums
+
+
+def batched_inverse_mod_prime(mats, p):
+    """Invert a stack of (n x n) matrices over GF(p): (inverses, invertible mask)"""
+    count, n, _ = mats.shape
+    eye = np.broadcast_to(np.eye(n, dtype=np.int64), (count, n, n))
+    aug = np.concatenate([mats % p, eye], axis=2)
+    ok = np.ones(count, dtype=bool)
+    inverse = np.array([0] + [pow(x, -1, p) for x in range(1, p)], dtype=np.int64)
+    batch = np.arange(count)
+    for col in range(n):
+        nonzero = aug[:, col:, col] != 0
+        ok &= nonzero.any(axis=1)
+        pivot = nonzero.argmax(axis=1) + col
+        pivot_rows = aug[batch, pivot].copy()
+        aug[batch, pivot] = aug[batch, col]
+        aug[batch, col] = pivot_rows
+        aug[:, col] = aug[:, col] * inverse[aug[:, col, col]][:, None] % p
+        factors = aug[:, :, col].copy()
+        factors[:, col] = 0
+        aug = (aug - factors[:, :, None] * aug[:, None, col]) % p
+    return aug[:, :, n:], ok
+
+
+def batched_inverse_mod26(mats):
+    inv2, ok2 = batched_inverse_mod_prime(mats, 2)
+    inv13, ok13 = batched_inverse_mod_prime(mats, 13)
+    return (13 * inv2 + 14 * inv13) % 26, ok2 & ok13
+
+
+def block_selections(m, n, batch_size, rng):
+    """Index arrays of n distinct blocks: all of them if few, else random batches"""
+    if comb(m, n) <= batch_size:
+        yield np.array(list(combinations(range(m), n)), dtype=np.int64)
+        return
+    while True:
+        yield np.argsort(rng.random((batch_size, m)), axis=1)[:, :n]
+
+
+def solve_block_size(plain, cipher, n, batch_size=4096, max_batches=8, seed=None):
+    """Key matrix (list of lists) for block size n, or None"""
+    m = min(len(plain), len(cipher)) // n
+    if m < n:
+        return None
+    P = plain[:m * n].reshape(m, n)
+    C = cipher[:m * n].reshape(m, n)
+    rng = np.random.default_rng(seed)
+    for selection in islice(block_selections(m, n, batch_size, rng), max_batches):
+        inverses, ok = batched_inverse_mod26(P[selection])
+        if not ok.any():
+            continue
+        # K^T for every invertible selection, then verify on all blocks
+        key_t = inverses[ok] @ C[selection[ok]] % 26
+        matches = ((P @ key_t) % 26 == C).all(axis=(1, 2))
+        if matches.any():
+            return key_t[matches.argmax()].T.tolist()
+    return None
+
+
+def solve_hill(plaintext, ciphertext, max_block=6, **options):
+    """Try block sizes 1..max_block: (n, key) for the first consistent key, or None"""
+    plain, cipher = text_to_nums(plaintext), text_to_nums(ciphertext)
+    for n in range(1, max_block + 1):
+        key = solve_block_size(plain, cipher, n, **options)
+        if key is not None:
+            return n, key
+    return None
+
+
+def random_key(n, rng):
+    while True:
+        key = rng.integers(0, 26, (n, n))
+        if batched_inverse_mod26(key[None])[1][0]:
+            return key.tolist()
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng()
+    plaintext = ''.join(chr(65 + v) for v in rng.integers(0, 26, 240))
+    for n in range(2, 7):
+        key = random_key(n, rng)
+        ciphertext = hill_encrypt(plaintext, key)
+        start = time.perf_counter()
+        found = solve_hill(plaintext, ciphertext, max_block=6)
+        elapsed = time.perf_counter() - start
+        ok = found is not None and found[1] == key
+        print(f"n={n}: recovered={ok} block={found[0] if found else None} time={elapsed:.4f}s")
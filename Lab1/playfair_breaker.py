@@ -0,0 +1,195 @@
+# Ciphertext-only attack on the Playfair cipher from q3.py.
+# Simulated annealing over key squares, scored by English quadgram
+# log-probabilities. Independent restarts run in a process pool.
+#
+# The quadgram table is a flat float array of 26^4 entries indexed by
+# ((a*26 + b)*26 + c)*26 + d, so scoring a candidate is one gather and a sum.
+# Load real statistics with load_quadgrams("english_quadgrams.txt") (lines of
+# "TION 13168375") or any large plain-text English corpus.
+
+import math
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from q3 import create_playfair_matrix, playfair_decrypt, playfair_encrypt
+from q4 import text_to_nums
+from sample_text import SAMPLE_TEXT
+
+ALPHABET = "ABCDEFGHIKLMNOPQRSTUVWXYZ"  # J excluded, as in q3
+
+
+def quadgram_codes(letters):
+    return ((letters[:-3] * 26 + letters[1:-2]) * 26 + letters[2:-1]) * 26 + letters[3:]
+
+
+def quadgram_table(counts):
+    """log10 probabilities from a 26^4 count array; unseen quadgrams get a floor"""
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum()
+    table = np.full(26 ** 4, math.log10(0.01 / total))
+    seen = counts > 0
+    table[seen] = np.log10(counts[seen] / total)
+    return table
+
+
+def load_quadgrams(path):
+    """Quadgram table from a "QUAD count" file or from plain English text"""
+    with open(path, encoding='utf-8', errors='ignore') as f:
+        text = f.read()
+    first = text.split('\n', 1)[0].split()
+    counts = np.zeros(26 ** 4)
+    if len(first) == 2 and first[1].isdigit():
+        for line in text.splitlines():
+            quad, count = line.split()
+            counts[quadgram_codes(text_to_nums(quad))[0]] += int(count)
+    else:
+        counts += np.bincount(quadgram_codes(text_to_nums(text)), minlength=26 ** 4)
+    return quadgram_table(counts)
+
+
+def sample_quadgrams():
+    # Tiny built-in corpus: enough to run the demo, too small for short ciphertexts
+    return quadgram_table(np.bincount(quadgram_codes(text_to_nums(SAMPLE_TEXT)),
+                                      minlength=26 ** 4))
+
+
+class PlayfairSearch:
+    """Scores key squares against one ciphertext.
+
+    The ciphertext is split once into digraph arrays; each candidate square
+    gets an inverse position map (letter -> cell) so decryption is a handful
+    of vectorized lookups.
+    """
+
+    def __init__(self, ciphertext, table):
+        letters = text_to_nums(ciphertext.upper().replace('J', 'I'))
+        if len(letters) % 2:
+            raise ValueError("Ciphertext must have an even number of letters")
+        self.first, self.second = letters[0::2], letters[1::2]
+        self.table = table
+
+    def decrypt(self, square):
+        """square: int array of 25 letter values in row-major order"""
+        position = np.zeros(26, dtype=np.int64)
+        position[square] = np.arange(25)
+        p1, p2 = position[self.first], position[self.second]
+        r1, c1, r2, c2 = p1 // 5, p1 % 5, p2 // 5, p2 % 5
+        same_row, same_col = r1 == r2, c1 == c2
+        # Rectangle: swap columns; same row: move left; same column: move up
+        nc1 = np.where(same_row, (c1 - 1) % 5, np.where(same_col, c1, c2))
+        nc2 = np.where(same_row, (c2 - 1) % 5, np.where(same_col, c2, c1))
+        nr1 = np.where(same_col & ~same_row, (r1 - 1) % 5, r1)
+        nr2 = np.where(same_col & ~same_row, (r2 - 1) % 5, r2)
+        plain = np.empty(2 * len(p1), dtype=np.int64)
+        plain[0::2] = square[nr1 * 5 + nc1]
+        plain[1::2] = square[nr2 * 5 + nc2]
+        return plain
+
+    def score(self, square):
+        return float(self.table[quadgram_codes(self.decrypt(square))].sum())
+
+
+def mutate(square, rng=random):
+    child = square.copy()
+    grid = child.reshape(5, 5)
+    move = rng.randrange(50)
+    if move == 0:  # swap two rows
+        i, j = rng.sample(range(5), 2)
+        grid[[i, j]] = grid[[j, i]]
+    elif move == 1:  # swap two columns
+        i, j = rng.sample(range(5), 2)
+        grid[:, [i, j]] = grid[:, [j, i]]
+    elif move == 2:
+        child = child[::-1].copy()
+    elif move == 3:
+        child = grid[::-1].ravel().copy()
+    elif move == 4:
+        child = grid[:, ::-1].ravel().copy()
+    else:  # swap two letters
+        i, j = rng.sample(range(25), 2)
+        child[i], child[j] = child[j], child[i]
+    return child
+
+
+def anneal(search, iterations=400000, temperature=None, seed=None):
+    """One simulated-annealing run from a random square: (score, key string).
+
+    The default starting temperature suits full English quadgram tables; it is
+    cooled linearly to 0.1 over the run.
+    """
+    rng = random.Random(seed)
+    if temperature is None:
+        temperature = 10 + 0.087 * (2 * len(search.first) - 84)
+    temperature = max(temperature, 1.0)
+
+    parent = np.array([ord(c) - 65 for c in ALPHABET], dtype=np.int64)
+    np.random.default_rng(rng.randrange(2 ** 32)).shuffle(parent)
+    parent_score = search.score(parent)
+    best, best_score = parent, parent_score
+    step = temperature / iterations
+    for _ in range(iterations):
+        child = mutate(parent, rng)
+        child_score = search.score(child)
+        delta = child_score - parent_score
+        if delta >= 0 or rng.random() < math.exp(delta / temperature):
+            parent, parent_score = child, child_score
+            if parent_score > best_score:
+                best, best_score = parent, parent_score
+        temperature = max(temperature - step, 0.1)
+    return best_score, ''.join(chr(65 + v) for v in best)
+
+
+_worker_search = None
+
+
+def _init_worker(ciphertext, table):
+    global _worker_search
+    _worker_search = PlayfairSearch(ciphertext, table)
+
+
+def _anneal_worker(args):
+    iterations, temperature, seed = args
+    return anneal(_worker_search, iterations, temperature, seed)
+
+
+def break_playfair(ciphertext, table=None, restarts=8, iterations=400000,
+                   temperature=None, workers=None):
+    """Best key squares over independent restarts: [(score, key, plaintext), ...].
+
+    key is the 25-letter square in row-major order (usable as a q3 key).
+    """
+    if table is None:
+        table = sample_quadgrams()
+    jobs = [(iterations, temperature, random.randrange(2 ** 32)) for _ in range(restarts)]
+    if not workers or workers <= 1:
+        _init_worker(ciphertext, table)
+        results = [_anneal_worker(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(ciphertext, table)) as pool:
+            results = list(pool.map(_anneal_worker, jobs))
+    results.sort(reverse=True)
+    return [(score, key, playfair_decrypt(key, ciphertext)) for score, key in results]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        table, options = load_quadgrams(sys.argv[1]), {}
+    else:
+        # The built-in table has a smaller score range, so start colder
+        table, options = sample_quadgrams(), {"temperature": 10, "iterations": 200000}
+    key = "GUIDANCE"
+    ciphertext = playfair_encrypt(key, SAMPLE_TEXT)
+    print("Key square:", ''.join(''.join(row) for row in create_playfair_matrix(key)))
+    print("Ciphertext:", ciphertext[:60], "...")
+
+    start = time.perf_counter()
+    results = break_playfair(ciphertext, table, restarts=4, workers=4, **options)
+    elapsed = time.perf_counter() - start
+    for score, found, plain in results:
+        print(f"{score:10.1f}  {found}  {plain[:50]}...")
+    print(f"Time: {elapsed:.2f}s")
@@ -1,64 +1,100 @@
+from functools import lru_cache
+
+
 def prepare_message(message):
     """Remove spaces and convert to uppercase"""
     return message.replace(" ", "").upper()
 
 
+class _CipherTable(dict):
+    """str.translate table that fills in non-ASCII letters on first use"""
+
+    def __init__(self, letter_map):
+        super().__init__()
+        self.letter_map = letter_map
+        for code in range(128):
+            self[code] = self.__missing__(code)
+
+    def __missing__(self, code):
+        value = self.letter_map(code - 65) if chr(code).isalpha() else None
+        self[code] = value
+        return value
+
+
+def compile_tables(a, b, mode='encrypt'):
+    """Compile x -> (a*x + b) mod 26 (or its inverse) into translate tables.
+
+    Returns (str_table, bytes_table, bytes_delete). Additive and multiplicative
+    keys are the special cases a=1 and b=0. Keys are reduced mod 26 first, so
+    equivalent keys share one cache entry.
+    """
+    return _cached_tables(a % 26, b % 26, mode)
+
+
+@lru_cache(maxsize=256)
+def _cached_tables(a, b, mode):
+    if mode == 'encrypt':
+        def letter_map(x):
+            return chr(((x * a + b) % 26) + 65)
+    else:
+        inverse = pow(a, -1, 26)  # ValueError if a is not coprime with 26
+
+        def letter_map(x):
+            return chr(((x - b) * inverse % 26) + 65)
+
+    str_table = _CipherTable(letter_map)
+
+    # Lowercase bytes map like their uppercase letter; everything else is deleted
+    bytes_table = bytearray(range(256))
+    for x in range(26):
+        bytes_table[65 + x] = bytes_table[97 + x] = ord(letter_map(x))
+    bytes_delete = bytes(c for c in range(256) if not (65 <= c <= 90 or 97 <= c <= 122))
+    return str_table, bytes(bytes_table), bytes_delete
+
+
+def _translate(message, a, b, mode, error):
+    try:
+        str_table = compile_tables(a, b, mode)[0]
+    except ValueError:
+        return error
+    return prepare_message(message).translate(str_table)
+
+
+def _translate_bytes(data, a, b, mode, error):
+    try:
+        _, bytes_table, bytes_delete = compile_tables(a, b, mode)
+    except ValueError:
+        raise ValueError(error) from None
+    return data.translate(bytes_table, bytes_delete)
+
+
 def additive_cipher(message, key, mode='encrypt'):
-    result = []
-    for char in prepare_message(message):
-        if char.isalpha():
-            if mode == 'encrypt':
-                new_char = chr(((ord(char) - 65 + key) % 26) + 65)
-            else:
-                new_char = chr(((ord(char) - 65 - key) % 26) + 65)
-            result.append(new_char)
-    return ''.join(result)
+    return _translate(message, 1, key, mode, None)
 
 
 def multiplicative_cipher(message, key, mode='encrypt'):
-    result = []
-
-    # Find modular inverse if decrypting
-    mod_inverse = None
-    if mode == 'decrypt':
-        for i in range(26):
-            if (key * i) % 26 == 1:
-                mod_inverse = i
-                break
-        if mod_inverse is None:
-            return "Error: Key must be coprime with 26 for decryption"
-
-    for char in prepare_message(message):
-        if char.isalpha():
-            if mode == 'encrypt':
-                new_char = chr(((ord(char) - 65) * key % 26) + 65)
-            else:
-                new_char = chr(((ord(char) - 65) * mod_inverse % 26) + 65)
-            result.append(new_char)
-    return ''.join(result)
+    return _translate(message, key, 0, mode,
+                      "Error: Key must be coprime with 26 for decryption")
 
 
 def affine_cipher(message, a, b, mode='encrypt'):
-    result = []
-
-    # Find modular inverse if decrypting
-    mod_inverse = None
-    if mode == 'decrypt':
-        for i in range(26):
-            if (a * i) % 26 == 1:
-                mod_inverse = i
-                break
-        if mod_inverse is None:
-            return "Error: First key must be coprime with 26 for decryption"
-
-    for char in prepare_message(message):
-        if char.isalpha():
-            if mode == 'encrypt':
-                new_char = chr((((ord(char) - 65) * a + b) % 26) + 65)
-            else:
-                new_char = chr(((ord(char) - 65 - b) * mod_inverse % 26) + 65)
-            result.append(new_char)
-    return ''.join(result)
+    return _translate(message, a, b, mode,
+                      "Error: First key must be coprime with 26 for decryption")
+
+
+# Bulk API: bytes in, bytes out (letters only, uppercased)
+def additive_cipher_bytes(data, key, mode='encrypt'):
+    return _translate_bytes(data, 1, key, mode, None)
+
+
+def multiplicative_cipher_bytes(data, key, mode='encrypt'):
+    return _translate_bytes(data, key, 0, mode,
+                            "Key must be coprime with 26 for decryption")
+
+
+def affine_cipher_bytes(data, a, b, mode='encrypt'):
+    return _translate_bytes(data, a, b, mode,
+                            "First key must be coprime with 26 for decryption")
 
 
 def main_menu():
@@ -0,0 +1,67 @@
+# Throughput benchmark: table-driven q1 ciphers vs the original per-character loop
+
+import random
+import string
+import time
+
+from q1 import affine_cipher, affine_cipher_bytes, prepare_message
+
+
+def loop_affine_cipher(message, a, b, mode='encrypt'):
+    """Original implementation: ord/chr/modulo for every character"""
+    result = []
+    mod_inverse = None
+    if mode == 'decrypt':
+        for i in range(26):
+            if (a * i) % 26 == 1:
+                mod_inverse = i
+                break
+        if mod_inverse is None:
+            return "Error: First key must be coprime with 26 for decryption"
+
+    for char in prepare_message(message):
+        if char.isalpha():
+            if mode == 'encrypt':
+                new_char = chr((((ord(char) - 65) * a + b) % 26) + 65)
+            else:
+                new_char = chr(((ord(char) - 65 - b) * mod_inverse % 26) + 65)
+            result.append(new_char)
+    return ''.join(result)
+
+
+def make_text(size):
+    alphabet = string.ascii_letters + "     .,"
+    return ''.join(random.choices(alphabet, k=size))
+
+
+def best_time(func, repeats=3):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes=(10_000, 1_000_000, 5_000_000), a=5, b=8):
+    for size in sizes:
+        text = make_text(size)
+        data = text.encode()
+
+        expected = loop_affine_cipher(text, a, b)
+        assert affine_cipher(text, a, b) == expected
+        assert affine_cipher_bytes(data, a, b) == expected.encode()
+
+        loop_t = best_time(lambda: loop_affine_cipher(text, a, b))
+        str_t = best_time(lambda: affine_cipher(text, a, b))
+        bytes_t = best_time(lambda: affine_cipher_bytes(data, a, b))
+
+        mb = size / (1024 * 1024)
+        print(f"--- {size} chars ({mb:.2f} MB) ---")
+        print(f"loop:            {loop_t:.4f}s  {mb / loop_t:8.2f} MB/s")
+        print(f"str.translate:   {str_t:.4f}s  {mb / str_t:8.2f} MB/s  ({loop_t / str_t:.1f}x)")
+        print(f"bytes.translate: {bytes_t:.4f}s  {mb / bytes_t:8.2f} MB/s  ({loop_t / bytes_t:.1f}x)\n")
+
+
+if __name__ == "__main__":
+    run()
@@ -1,49 +1,148 @@
+import numpy as np
+
+
 def prepare_message(message):
     """Remove spaces and convert to uppercase"""
     return message.replace(" ", "").upper()
 
 
+def vigenere_shift(values, shifts, offset=0):
+    """Add the repeating key shifts to an array of letter values (0-25) mod 26.
+
+    Whole key periods are added as a single broadcast over an (n // k, k) view;
+    offset is the key position of values[0].
+    """
+    k = len(shifts)
+    shifts = np.roll(shifts, -(offset % k))
+    n = len(values)
+    full = n - n % k
+    out = np.empty(n, dtype=np.uint8)
+    out[:full].reshape(-1, k)[:] = (values[:full].reshape(-1, k) + shifts) % 26
+    out[full:] = (values[full:] + shifts[:n - full]) % 26
+    return out
+
+
+def letters_to_array(data):
+    """Uppercase bytes -> uint8 array of letter values, dropping non-letters"""
+    arr = np.frombuffer(data.upper(), dtype=np.uint8)
+    return arr[(arr >= 65) & (arr <= 90)] - 65
+
+
+def text_values(text):
+    """Letter values congruent to (code point - 65) mod 26 for every character
+    of a str, plus the mask of characters str.isalpha accepts.
+
+    Non-ASCII letters count as letters and keep that value, as in the
+    character-by-character ciphers this module replaced. Callers reduce mod 26.
+    """
+    if text.isascii():
+        codes = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+        letters = ((codes | 32) - 97) < 26  # A-Z or a-z
+        return codes - 65, letters          # only non-letters wrap, and they are masked out
+    codes = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    letters = ((codes >= 65) & (codes <= 90)) | ((codes >= 97) & (codes <= 122))
+    wide = np.flatnonzero(codes > 127)
+    letters[wide] = [text[i].isalpha() for i in wide.tolist()]
+    return ((codes.astype(np.int64) - 65) % 26).astype(np.uint8), letters
+
+
+class VigenereStream:
+    """Chunked Vigenère encryptor/decryptor that carries the key position.
+
+    Every character (after space removal when encrypting) advances the key.
+    update takes bytes and outputs A-Z only; update_text takes a str and, like
+    vigenere_encrypt/vigenere_decrypt, also shifts and keeps non-ASCII letters.
+    Keyword characters shift by (ord(c.upper()) - 65) mod 26, letters or not.
+    """
+
+    def __init__(self, keyword, mode='encrypt'):
+        shifts = (np.array([ord(c.upper()) - 65 for c in keyword], dtype=np.int64) % 26).astype(np.uint8)
+        self.shifts = shifts if mode == 'encrypt' else (26 - shifts) % 26
+        self.mode = mode
+        self.position = 0
+
+    def _shift(self, values):
+        shifted = vigenere_shift(values, self.shifts, self.position)
+        self.position = (self.position + len(values)) % len(self.shifts)
+        return shifted
+
+    def update(self, chunk):
+        if self.mode == 'encrypt':
+            chunk = chunk.replace(b" ", b"").upper()
+        arr = np.frombuffer(chunk, dtype=np.uint8)
+        shifted = self._shift(arr - 65)      # non-letters wrap, but are dropped below
+        return (shifted[(arr >= 65) & (arr <= 90)] + 65).tobytes()
+
+    def update_text(self, text):
+        if self.mode == 'encrypt':
+            text = prepare_message(text)
+        values, letters = text_values(text)
+        return (self._shift(values)[letters] + 65).tobytes().decode('ascii')
+
+    def finalize(self):
+        return b""
+
+
+class AutokeyStream:
+    """Chunked autokey encryptor/decryptor over the letters of the input.
+
+    The feedback letter (initially the key) is carried across chunks.
+    update takes bytes (A-Z letters only); update_text takes a str and also
+    keeps non-ASCII letters, valued (ord - 65) mod 26.
+    Decryption solves p[i] = c[i] - p[i-1] in closed form with an alternating
+    prefix sum: p[i] = (-1)^i * (sum_j (-1)^j c[j] - key) mod 26.
+    """
+
+    def __init__(self, key, mode='encrypt'):
+        if isinstance(key, str):
+            key = ord(key.upper()) - 65
+        self.feedback = key % 26
+        self.mode = mode
+
+    def update(self, chunk):
+        return self._feed(letters_to_array(chunk))
+
+    def update_text(self, text):
+        values, letters = text_values(text)
+        return self._feed(values[letters]).decode('ascii')
+
+    def _feed(self, values):
+        if len(values) == 0:
+            return b""
+        if self.mode == 'encrypt':
+            keys = np.empty_like(values)
+            keys[0] = self.feedback
+            keys[1:] = values[:-1]
+            result = (values + keys) % 26
+            self.feedback = int(values[-1])
+        else:
+            sums = values.astype(np.int64)
+            sums[1::2] *= -1
+            result = np.cumsum(sums) - self.feedback
+            result[1::2] *= -1
+            result = (result % 26).astype(np.uint8)
+            self.feedback = int(result[-1])
+        return (result + 65).tobytes()
+
+    def finalize(self):
+        return b""
+
+
 def vigenere_encrypt(message, keyword):
-    encrypted = []
-    keyword_repeated = (keyword * (len(message) // len(keyword) + 1))[:len(message)]
-    for m_char, k_char in zip(prepare_message(message), keyword_repeated):
-        if m_char.isalpha():
-            shift = ord(k_char.upper()) - 65
-            encrypted_char = chr(((ord(m_char) - 65 + shift) % 26) + 65)
-            encrypted.append(encrypted_char)
-    return ''.join(encrypted)
+    return VigenereStream(keyword, 'encrypt').update_text(message)
 
 
 def vigenere_decrypt(ciphertext, keyword):
-    decrypted = []
-    keyword_repeated = (keyword * (len(ciphertext) // len(keyword) + 1))[:len(ciphertext)]
-    for c_char, k_char in zip(ciphertext, keyword_repeated):
-        if c_char.isalpha():
-            shift = ord(k_char.upper()) - 65
-            decrypted_char = chr(((ord(c_char) - 65 - shift) % 26) + 65)
-            decrypted.append(decrypted_char)
-    return ''.join(decrypted)
+    return VigenereStream(keyword, 'decrypt').update_text(ciphertext)
 
 
 def autokey_encrypt(message, key):
-    encrypted = []
-    message_clean = prepare_message(message)
-    key_stream = str(key) + message_clean[:-1]  # Autokey uses plaintext as subsequent keys
-    for m_char, k_char in zip(message_clean, key_stream):
-        shift = ord(k_char.upper()) - 65
-        encrypted_char = chr(((ord(m_char) - 65 + shift) % 26) + 65)
-        encrypted.append(encrypted_char)
-    return ''.join(encrypted)
+    # key is the shift of the first letter (7 = 'H'); plaintext supplies the rest
+    return AutokeyStream(key, 'encrypt').update_text(prepare_message(message))
 
 
 def autokey_decrypt(ciphertext, key):
-    decrypted = []
-    key_char = chr(key + 65)
-    for c_char in ciphertext:
-        decrypted_char = chr(((ord(c_char) - 65 - (ord(key_char) - 65)) % 26) + 65)
-        decrypted.append(decrypted_char)
-        key_char = decrypted_char  # Autokey uses decrypted text as subsequent keys
-    return ''.join(decrypted)
+    return AutokeyStream(key, 'decrypt').update_text(ciphertext)
 
 
 def main():
@@ -1,3 +1,12 @@
+from functools import lru_cache
+
+import numpy as np
+
+LETTERS = bytes(range(65, 91))
+NON_LETTERS = bytes(c for c in range(256) if c not in LETTERS)
+J_TO_I = bytes.maketrans(b"J", b"I")
+
+
 def create_playfair_matrix(key):
     key = key.upper().replace('J', 'I')
     matrix = []
@@ -29,34 +38,39 @@ def find_position(matrix, char):
     return None
 
 
+def letters_only(text, j_to_i=True):
+    """Upper-case A-Z bytes of a str or bytes chunk; everything else dropped.
+
+    J is merged into I for the Playfair square unless j_to_i is False.
+    """
+    if isinstance(text, str):
+        text = text.upper().encode('ascii', 'ignore')
+    else:
+        text = text.upper()
+    return text.translate(J_TO_I if j_to_i else None, NON_LETTERS)
+
+
+def prepare_letters(letters):
+    """Digraph-ready bytes: 'X' after a letter that starts a doubled pair, 'X' padding"""
+    codes = np.frombuffer(letters, dtype=np.uint8)
+    # Only doubled letters can shift the pairing, so walk just those: a double
+    # at an even distance from the current pair start gets an X after it, and
+    # either way the next pair starts right after it
+    inserts = []
+    start = 0
+    for i in np.flatnonzero(codes[:-1] == codes[1:]).tolist():
+        if i >= start:
+            if (i - start) % 2 == 0:
+                inserts.append(i + 1)
+            start = i + 1
+    out = np.insert(codes, inserts, ord('X')) if inserts else codes
+    if len(out) % 2:
+        out = np.append(out, np.uint8(ord('X')))  # Padding if last letter has no pair
+    return out.tobytes()
+
+
 def prepare_text(text):
-    text = text.upper().replace('J', 'I')
-    # Remove non-alpha characters
-    text = ''.join(filter(str.isalpha, text))
-
-    result = ""
-    i = 0
-    while i < len(text):
-        a = text[i]
-        b = ''
-        if i + 1 < len(text):
-            b = text[i+1]
-        else:
-            b = 'X'  # Padding if last letter has no pair
-
-        if a == b:
-            # Insert 'X' between same letters
-            result += a + 'X'
-            i += 1
-        else:
-            result += a + b
-            i += 2
-
-    # If length is odd, pad with 'X'
-    if len(result) % 2 != 0:
-        result += 'X'
-
-    return result
+    return prepare_letters(letters_only(text)).decode('ascii')
 
 
 def encode_pair(matrix, a, b):
@@ -74,22 +88,66 @@ def encode_pair(matrix, a, b):
         return matrix[r1][c2] + matrix[r2][c1]
 
 
+class PlayfairKey:
+    """Key square with every digraph precomputed.
+
+    encrypt_table maps each of the 25x25 possible digraphs to its ciphertext;
+    decrypt_table is its inverse (each Playfair rule is a bijection on pairs).
+    encrypt_codes/decrypt_codes hold the same mappings as (26 * 26, 2) byte
+    arrays indexed by 26 * (a - 'A') + (b - 'A'), so whole texts are mapped
+    with one NumPy lookup instead of a list of 2-character strings.
+    """
+
+    def __init__(self, key):
+        self.matrix = create_playfair_matrix(key)
+        letters = [char for row in self.matrix for char in row]
+        self.encrypt_table = {a + b: encode_pair(self.matrix, a, b)
+                              for a in letters for b in letters}
+        self.decrypt_table = {c: p for p, c in self.encrypt_table.items()}
+        self.encrypt_codes = self._code_table(self.encrypt_table)
+        self.decrypt_codes = self._code_table(self.decrypt_table)
+
+    @staticmethod
+    def _code_table(table):
+        codes = np.zeros((26 * 26, 2), dtype=np.uint8)
+        for pair, out in table.items():
+            codes[26 * (ord(pair[0]) - 65) + ord(pair[1]) - 65] = [ord(out[0]), ord(out[1])]
+        return codes
+
+    def _apply(self, codes, letters):
+        text = np.frombuffer(letters, dtype=np.uint8)
+        index = (text[0::2] - 65).astype(np.uint16) * 26 + (text[1::2] - 65)
+        return codes[index].tobytes().decode('ascii')
+
+    def encrypt(self, plaintext):
+        return self._apply(self.encrypt_codes, prepare_letters(letters_only(plaintext)))
+
+    def decrypt(self, ciphertext):
+        text = letters_only(ciphertext)
+        if len(text) % 2 != 0:
+            raise ValueError("Ciphertext must have an even number of letters")
+        return self._apply(self.decrypt_codes, text)
+
+
+@lru_cache(maxsize=32)
+def playfair_key(key):
+    """Compiled PlayfairKey, built once per key string"""
+    return PlayfairKey(key)
+
+
 def playfair_encrypt(key, plaintext):
-    matrix = create_playfair_matrix(key)
-    prepared_text = prepare_text(plaintext)
+    return playfair_key(key).encrypt(plaintext)
 
-    ciphertext = ""
-    for i in range(0, len(prepared_text), 2):
-        a = prepared_text[i]
-        b = prepared_text[i+1]
-        ciphertext += encode_pair(matrix, a, b)
 
-    return ciphertext
+def playfair_decrypt(key, ciphertext):
+    return playfair_key(key).decrypt(ciphertext)
 
 
-# Given values
-key = "GUIDANCE"
-plaintext = input("Enter plain text: ")
+if __name__ == "__main__":
+    # Given values
+    key = "GUIDANCE"
+    plaintext = input("Enter plain text: ")
 
-ciphertext = playfair_encrypt(key, plaintext)
-print("Ciphertext:", ciphertext)
+    ciphertext = playfair_encrypt(key, plaintext)
+    print("Ciphertext:", ciphertext)
+    print("Decrypted:", playfair_decrypt(key, ciphertext))
@@ -1,3 +1,8 @@
+from functools import cached_property, lru_cache
+
+import numpy as np
+
+
 def letter_to_num(c):
     # Capital letter mapping: A=0,...,Z=25
     return ord(c.upper()) - ord('A')
@@ -6,25 +11,87 @@ def num_to_letter(n):
     # Map number back to capital letter
     return chr((n % 26) + ord('A'))
 
+def text_to_nums(text):
+    # Letters only, as an int array A=0,...,Z=25
+    arr = np.frombuffer(text.upper().encode('ascii', 'ignore'), dtype=np.uint8)
+    return arr[(arr >= 65) & (arr <= 90)].astype(np.int64) - 65
+
+def nums_to_text(nums):
+    return (np.asarray(nums) % 26 + 65).astype(np.uint8).tobytes().decode()
+
+def inverse_mod_prime(matrix, p):
+    # Gauss-Jordan elimination over GF(p); None if the matrix is singular mod p
+    n = len(matrix)
+    aug = np.concatenate([np.asarray(matrix, dtype=np.int64) % p,
+                          np.eye(n, dtype=np.int64)], axis=1)
+    for col in range(n):
+        pivots = np.flatnonzero(aug[col:, col]) + col
+        if len(pivots) == 0:
+            return None
+        aug[[col, pivots[0]]] = aug[[pivots[0], col]]
+        aug[col] = aug[col] * pow(int(aug[col, col]), -1, p) % p
+        aug = (aug - np.outer(aug[:, col], aug[col]) * (np.arange(n) != col)[:, None]) % p
+    return aug[:, n:]
+
+def matrix_inverse_mod26(matrix):
+    # Z/26 = Z/2 x Z/13: invert over both fields and recombine with the CRT
+    inv2 = inverse_mod_prime(matrix, 2)
+    inv13 = inverse_mod_prime(matrix, 13)
+    if inv2 is None or inv13 is None:
+        raise ValueError("Key matrix is not invertible mod 26")
+    return (13 * inv2 + 14 * inv13) % 26
+
+
+class HillKey:
+    """n x n Hill key, reusable across messages.
+
+    The message is reshaped into an (n_blocks x n) matrix and multiplied by the
+    key in one operation; the inverse key is computed on first decryption.
+    """
+
+    def __init__(self, key):
+        self.key = np.array(key, dtype=np.int64) % 26
+        self.n = len(self.key)
+        if self.key.shape != (self.n, self.n):
+            raise ValueError("Key must be a square matrix")
+
+    @cached_property
+    def inverse(self):
+        return matrix_inverse_mod26(self.key)
+
+    def _blocks(self, text):
+        nums = text_to_nums(text)
+        # Pad with X to a whole number of blocks
+        pad = -len(nums) % self.n
+        nums = np.concatenate([nums, np.full(pad, 23, dtype=np.int64)])
+        return nums.reshape(-1, self.n)
+
+    def encrypt(self, plaintext):
+        # Row-vector form of c = K p for every block at once
+        return nums_to_text(self._blocks(plaintext) @ self.key.T % 26)
+
+    def decrypt(self, ciphertext):
+        return nums_to_text(self._blocks(ciphertext) @ self.inverse.T % 26)
+
+
+@lru_cache(maxsize=32)
+def _hill_key(key):
+    return HillKey(key)
+
+def hill_key(key):
+    # Cached HillKey for a key given as nested lists
+    return _hill_key(tuple(map(tuple, key)))
+
 def hill_encrypt(plaintext, key):
-    # Remove spaces and make uppercase
-    raw = ''.join([c for c in plaintext.upper() if c.isalpha()])
-    # Pad with X if needed
-    if len(raw) % 2 == 1:
-        raw += 'X'
-    ciphertext = ''
-    for i in range(0, len(raw), 2):
-        # Block of 2 letters
-        a = letter_to_num(raw[i])
-        b = letter_to_num(raw[i+1])
-        # Matrix multiplication mod 26
-        c1 = (key[0][0] * a + key[0][1] * b) % 26
-        c2 = (key[1][0] * a + key[1][1] * b) % 26
-        ciphertext += num_to_letter(c1) + num_to_letter(c2)
-    return ciphertext
-
-# Define key matrix as per the question
-key = [[3, 3], [2, 7]]
-msg = input("Enter the message: ")
-cipher = hill_encrypt(msg, key)
-print(cipher)
+    return hill_key(key).encrypt(plaintext)
+
+def hill_decrypt(ciphertext, key):
+    return hill_key(key).decrypt(ciphertext)
+
+if __name__ == "__main__":
+    # Define key matrix as per the question
+    key = [[3, 3], [2, 7]]
+    msg = input("Enter the message: ")
+    cipher = hill_encrypt(msg, key)
+    print(cipher)
+    print(hill_decrypt(cipher, key))
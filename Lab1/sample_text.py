@@ -0,0 +1,15 @@
+# English sample corpus shared by the Lab1 crackers for demos, benchmarks and
+# a fallback quadgram table.
+
+SAMPLE_TEXT = """
+It is a truth universally acknowledged that a single man in possession of a good
+fortune must be in want of a wife. However little known the feelings or views of
+such a man may be on his first entering a neighbourhood, this truth is so well
+fixed in the minds of the surrounding families that he is considered as the
+rightful property of some one or other of their daughters. The history of
+cryptography shows that every cipher which hides the frequency of letters badly
+will eventually be broken by patient analysis, and the Vigenere cipher, once
+called indecipherable, fell to the methods of Babbage and Kasiski in the middle
+of the nineteenth century when they noticed that repeated words in the plaintext
+were sometimes encrypted by the same part of the key.
+"""
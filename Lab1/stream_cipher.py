@@ -0,0 +1,183 @@
+# Streaming file mode for the Lab1 classical ciphers.
+#
+# Every cipher is wrapped in an object with update(chunk) -> bytes and
+# finalize() -> bytes, so a file of any size is processed in fixed-size
+# chunks with bounded memory. State that spans chunk boundaries is carried
+# by the stream: Vigenère key position and autokey feedback (q2), the pending
+# odd letter of a Playfair digraph (q3) and a partial Hill block (q4).
+#
+# Like prepare_message, output is letters only (uppercased). q5/q6 are the
+# additive/affine ciphers and use the q1 streams.
+#
+# Usage:
+#   python stream_cipher.py encrypt vigenere --key LEMON plain.txt cipher.txt
+#   python stream_cipher.py decrypt affine --key 5,8 cipher.txt plain.txt
+#   python stream_cipher.py encrypt hill --key 3,3,2,7 plain.txt cipher.txt
+
+import argparse
+import math
+import re
+import time
+
+from q1 import additive_cipher_bytes, affine_cipher_bytes, multiplicative_cipher_bytes
+from q2 import AutokeyStream, VigenereStream
+from q3 import letters_only, playfair_key
+from q4 import hill_key
+
+# Greedy Playfair pairing as in q3.prepare_text: a letter followed by a
+# different one forms a pair; a repeated letter (or the end) leaves it alone
+PLAYFAIR_PAIR = re.compile(r'(.)(?:(?!\1)(.))?')
+
+
+class TranslateStream:
+    """q1 additive/multiplicative/affine ciphers: no state between chunks"""
+
+    def __init__(self, func, *key):
+        self.func = func
+        self.key = key
+
+    def update(self, chunk):
+        return self.func(chunk, *self.key)
+
+    def finalize(self):
+        return b""
+
+
+class LetterStream:
+    """Feeds letters-only chunks to a q2 stream so the key stays aligned with
+    the output (q2 advances the key over punctuation and newlines too)"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def update(self, chunk):
+        return self.stream.update(letters_only(chunk, j_to_i=False))
+
+    def finalize(self):
+        return self.stream.finalize()
+
+
+class PlayfairStream:
+    """Playfair over a stream; the unpaired last letter waits for the next chunk"""
+
+    def __init__(self, key, mode='encrypt'):
+        compiled = playfair_key(key)
+        self.table = compiled.encrypt_table if mode == 'encrypt' else compiled.decrypt_table
+        self.mode = mode
+        self.pending = ''
+
+    def update(self, chunk):
+        text = self.pending + letters_only(chunk).decode()
+        table = self.table
+        if self.mode == 'encrypt':
+            pairs = PLAYFAIR_PAIR.findall(text)
+            # An unpaired final letter may pair with the next chunk's first
+            self.pending = pairs.pop()[0] if pairs and not pairs[-1][1] else ''
+            out = ''.join([table[a + (b or 'X')] for a, b in pairs])
+        else:
+            even = len(text) - len(text) % 2
+            self.pending = text[even:]
+            out = ''.join([table[text[i:i+2]] for i in range(0, even, 2)])
+        return out.encode()
+
+    def finalize(self):
+        if not self.pending:
+            return b""
+        if self.mode != 'encrypt':
+            raise ValueError("Ciphertext must have an even number of letters")
+        pending, self.pending = self.pending, ''
+        return self.table[pending + 'X'].encode()
+
+
+class HillStream:
+    """Hill cipher over a stream; a partial block waits for the next chunk"""
+
+    def __init__(self, key, mode='encrypt'):
+        self.key = hill_key(key)
+        self.mode = mode
+        self.pending = b""
+
+    def _apply(self, letters):
+        text = letters.decode()
+        return (self.key.encrypt(text) if self.mode == 'encrypt' else self.key.decrypt(text)).encode()
+
+    def update(self, chunk):
+        letters = self.pending + letters_only(chunk, j_to_i=False)
+        full = len(letters) - len(letters) % self.key.n
+        self.pending = letters[full:]
+        return self._apply(letters[:full]) if full else b""
+
+    def finalize(self):
+        pending, self.pending = self.pending, b""
+        return self._apply(pending) if pending else b""  # padded with X
+
+
+def parse_ints(key):
+    return [int(v) for v in key.replace(',', ' ').split()]
+
+
+def make_stream(cipher, key, mode='encrypt'):
+    if cipher == 'additive':
+        return TranslateStream(additive_cipher_bytes, int(key), mode)
+    if cipher == 'multiplicative':
+        return TranslateStream(multiplicative_cipher_bytes, int(key), mode)
+    if cipher == 'affine':
+        a, b = parse_ints(key)
+        return TranslateStream(affine_cipher_bytes, a, b, mode)
+    if cipher == 'vigenere':
+        return LetterStream(VigenereStream(key, mode))
+    if cipher == 'autokey':
+        return LetterStream(AutokeyStream(int(key) if key.isdigit() else key, mode))
+    if cipher == 'playfair':
+        return PlayfairStream(key, mode)
+    if cipher == 'hill':
+        values = parse_ints(key)
+        n = math.isqrt(len(values))
+        if n * n != len(values):
+            raise ValueError("Hill key must have n*n numbers")
+        return HillStream([values[i*n:(i+1)*n] for i in range(n)], mode)
+    raise ValueError(f"Unknown cipher: {cipher}")
+
+
+def stream_file(src, dst, stream, chunk_size=1 << 20):
+    """Run src through the stream into dst chunk by chunk; returns bytes read"""
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    total = 0
+    with open(src, 'rb') as fin, open(dst, 'wb') as fout:
+        while True:
+            n = fin.readinto(buffer)
+            if not n:
+                break
+            total += n
+            fout.write(stream.update(bytes(view[:n])))
+        fout.write(stream.finalize())
+    return total
+
+
+CIPHERS = ['additive', 'multiplicative', 'affine', 'vigenere', 'autokey', 'playfair', 'hill']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Encrypt or decrypt a file with a Lab1 cipher")
+    commands = parser.add_subparsers(dest='mode', required=True)
+    for mode in ('encrypt', 'decrypt'):
+        command = commands.add_parser(mode)
+        command.add_argument('cipher', choices=CIPHERS)
+        command.add_argument('--key', required=True,
+                             help="int, 'a,b' (affine), word, or n*n ints (hill)")
+        command.add_argument('--chunk-size', type=int, default=1 << 20)
+        command.add_argument('infile')
+        command.add_argument('outfile')
+    args = parser.parse_args(argv)
+
+    stream = make_stream(args.cipher, args.key, args.mode)
+    start = time.perf_counter()
+    total = stream_file(args.infile, args.outfile, stream, args.chunk_size)
+    elapsed = time.perf_counter() - start
+    print(f"{args.mode}ed {total} bytes in {elapsed:.3f}s "
+          f"({total / max(elapsed, 1e-9) / 1e6:.2f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# Ciphertext-only attack on the Vigenère cipher from q2.py.
+# 1. Estimate the key length from the index of coincidence of the columns
+#    (every L-th letter) and Kasiski distances between repeated trigrams.
+# 2. Each column is a shift cipher: solve all columns at once with the
+#    chi-squared tables from chi_squared_cracker.py.
+
+import random
+import time
+
+import numpy as np
+
+from chi_squared_cracker import score_keys
+from q2 import vigenere_decrypt, vigenere_encrypt
+from q4 import nums_to_text, text_to_nums
+from sample_text import SAMPLE_TEXT
+
+ENGLISH_IOC = 0.0667
+RANDOM_IOC = 1 / 26
+
+
+def column_counts(letters, length):
+    """(length, 26) letter counts of the columns letters[i::length]"""
+    columns = np.arange(len(letters)) % length
+    return np.bincount(columns * 26 + letters, minlength=length * 26).reshape(length, 26)
+
+
+def column_ioc(letters, length):
+    """Mean index of coincidence over the columns for one key length"""
+    counts = column_counts(letters, length)
+    totals = counts.sum(axis=1)
+    pairs = np.maximum(totals * (totals - 1), 1)
+    return float(((counts * (counts - 1)).sum(axis=1) / pairs).mean())
+
+
+def kasiski_distances(letters, ngram=3):
+    """Distances between consecutive occurrences of every repeated n-gram"""
+    if len(letters) < ngram:
+        return np.empty(0, dtype=np.int64)
+    codes = np.zeros(len(letters) - ngram + 1, dtype=np.int64)
+    for i in range(ngram):
+        codes = codes * 26 + letters[i:len(letters) - ngram + 1 + i]
+    order = np.argsort(codes, kind='stable')  # positions stay ascending per n-gram
+    sorted_codes = codes[order]
+    repeat = sorted_codes[1:] == sorted_codes[:-1]
+    return (order[1:] - order[:-1])[repeat]
+
+
+def estimate_key_lengths(ciphertext, max_length=20, top=3):
+    """Rank key lengths as [(length, ioc, kasiski), ...].
+
+    The score adds the normalized column IoC (1.0 for English-like columns) to
+    the fraction of Kasiski distances divisible by the length: multiples of the
+    true length match on IoC but lose Kasiski support, divisors the reverse.
+    """
+    letters = text_to_nums(ciphertext)
+    max_length = max(1, min(max_length, len(letters) // 2))
+    lengths = np.arange(1, max_length + 1)
+    ioc = np.array([column_ioc(letters, length) for length in lengths])
+    distances = kasiski_distances(letters)
+    if len(distances):
+        kasiski = (distances[None, :] % lengths[:, None] == 0).mean(axis=1)
+        kasiski[0] = 0  # every distance is a multiple of 1
+    else:
+        kasiski = np.zeros(len(lengths))
+    score = (ioc - RANDOM_IOC) / (ENGLISH_IOC - RANDOM_IOC) + kasiski
+    best = np.argsort(-score, kind='stable')[:top]
+    return [(int(lengths[i]), float(ioc[i]), float(kasiski[i])) for i in best]
+
+
+def solve_columns(letters, length):
+    """Best shift per column and the mean chi-squared score of that keyword"""
+    scores = score_keys(column_counts(letters, length))
+    shifts = scores.argmin(axis=1)
+    keyword = ''.join(chr(65 + int(s)) for s in shifts)
+    return keyword, float(scores.min(axis=1).mean())
+
+
+def shortest_period(keyword):
+    """LEMONLEMON -> LEMON"""
+    for length in range(1, len(keyword)):
+        if len(keyword) % length == 0 and keyword == keyword[:length] * (len(keyword) // length):
+            return keyword[:length]
+    return keyword
+
+
+def crack_vigenere(ciphertext, max_length=20, top=3):
+    """Candidate keywords as [(keyword, chi2, plaintext), ...], best key length first"""
+    letters = text_to_nums(ciphertext)
+    candidates = []
+    for length, _, _ in estimate_key_lengths(ciphertext, max_length, top):
+        keyword, score = solve_columns(letters, length)
+        keyword = shortest_period(keyword)
+        if keyword not in [c[0] for c in candidates]:
+            candidates.append((keyword, score, vigenere_decrypt(ciphertext, keyword)))
+    return candidates
+
+
+def clean(text):
+    """Letters-only uppercase text (q2 advances the key over punctuation too)"""
+    return nums_to_text(text_to_nums(text))
+
+
+def random_english(size):
+    """Letters-only English-like text of the given length from SAMPLE_TEXT words"""
+    words = SAMPLE_TEXT.split()
+    return clean(''.join(random.choices(words, k=size // 3 + 10)))[:size]
+
+
+def benchmark(sizes=(1_000, 10_000, 100_000, 1_000_000), keyword="LEMONADE", repeats=3):
+    for size in sizes:
+        ciphertext = vigenere_encrypt(random_english(size), keyword)
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = crack_vigenere(ciphertext)
+            best = min(best, time.perf_counter() - start)
+        found = result[0][0]
+        print(f"{size:>9} letters: {best:.4f}s  {size / best / 1e6:6.2f} M letters/s  "
+              f"key={found} ok={found == keyword}")
+
+
+if __name__ == "__main__":
+    keyword = "DOLLARS"
+    ciphertext = vigenere_encrypt(clean(SAMPLE_TEXT), keyword)
+    print("Ciphertext:", ciphertext[:60], "...")
+
+    print("\nKey length estimates (length, IoC, Kasiski):")
+    for length, ioc, kasiski in estimate_key_lengths(ciphertext):
+        print(f"  {length:2d}  {ioc:.4f}  {kasiski:.2f}")
+
+    print("\nCandidate keywords:")
+    for kw, score, plain in crack_vigenere(ciphertext):
+        print(f"  {kw:<12} chi2={score:7.2f}  {plain[:50]}...")
+
+    print("\n=== Benchmark ===")
+    benchmark()
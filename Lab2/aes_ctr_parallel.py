@@ -0,0 +1,119 @@
+# Multi-process AES-CTR for large files.
+#
+# The output file is created at full size up front; the input and output are
+# then memory-mapped by each worker process, which encrypts its own
+# block-aligned byte range straight from one mapping into the other. The
+# range starting at byte `start` uses counter block start // 16, so the
+# workers cover disjoint counter ranges and the result is identical to a
+# single AES.new(key, AES.MODE_CTR, nonce=nonce) pass over the whole file.
+# Nothing but the range bounds passes through the parent process.
+#
+# CTR is its own inverse: decrypt by running the same command on the output.
+#
+# Usage:
+#   python aes_ctr_parallel.py --key <hex> --nonce <hex> in.bin out.bin --workers 4
+#   python aes_ctr_parallel.py --benchmark --size-mb 512
+
+import argparse
+import mmap
+import os
+import tempfile
+import time
+
+from Crypto.Cipher import AES
+
+from file_jobs import block_ranges, check_distinct, run_jobs
+
+BLOCK = AES.block_size
+NONCE_SIZE = 8  # 8-byte nonce, 8-byte block counter
+SLICE = 8 << 20  # bytes encrypted per call inside a worker
+
+
+def _ctr_range(args):
+    src, dst, key, nonce, start, end = args
+    with open(src, 'rb') as fin, open(dst, 'r+b') as fout, \
+            mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as mm_in, \
+            mmap.mmap(fout.fileno(), 0) as mm_out:
+        cipher = AES.new(key, AES.MODE_CTR, nonce=nonce, initial_value=start // BLOCK)
+        src_view, dst_view = memoryview(mm_in), memoryview(mm_out)
+        try:
+            for pos in range(start, end, SLICE):
+                stop = min(pos + SLICE, end)
+                cipher.encrypt(src_view[pos:stop], output=dst_view[pos:stop])
+        finally:
+            src_view.release()
+            dst_view.release()
+    return end - start
+
+
+def ctr_file(src, dst, key, nonce, workers=None):
+    """AES-CTR src into dst (encrypt and decrypt alike); returns bytes processed"""
+    if len(nonce) != NONCE_SIZE:
+        raise ValueError(f"Nonce must be {NONCE_SIZE} bytes")
+    check_distinct(src, dst)
+    size = os.path.getsize(src)
+    with open(dst, 'wb') as f:
+        f.truncate(size)
+    if size == 0:
+        return 0
+    ranges = block_ranges(-(-size // BLOCK), workers or 1)
+    jobs = [(src, dst, key, nonce, start * BLOCK, min(end * BLOCK, size)) for start, end in ranges]
+    return sum(run_jobs(_ctr_range, jobs, workers))
+
+
+def benchmark(size_mb=256, max_workers=None):
+    """MB/s for 1..max_workers processes on a temporary file"""
+    max_workers = max_workers or os.cpu_count() or 1
+    key, nonce = os.urandom(32), os.urandom(NONCE_SIZE)
+    workers_list = sorted({1, 2, 4, 8, max_workers} & set(range(1, max_workers + 1)))
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = os.path.join(tmp, "plain"), os.path.join(tmp, "cipher")
+        with open(src, 'wb') as f:
+            for _ in range(size_mb):
+                f.write(os.urandom(1 << 20))
+
+        start = time.perf_counter()
+        with open(src, 'rb') as f:
+            reference = AES.new(key, AES.MODE_CTR, nonce=nonce).encrypt(f.read())
+        single_t = time.perf_counter() - start
+        print(f"{size_mb} MB, {os.cpu_count()} CPU(s)")
+        print(f"in-memory AES.new: {size_mb / single_t:8.1f} MB/s")
+
+        base_rate = None
+        for workers in workers_list:
+            start = time.perf_counter()
+            ctr_file(src, dst, key, nonce, workers)
+            rate = size_mb / (time.perf_counter() - start)
+            base_rate = base_rate or rate
+            with open(dst, 'rb') as f:
+                same = f.read() == reference
+            print(f"{workers:3d} process(es): {rate:8.1f} MB/s  speedup {rate / base_rate:5.2f}x  "
+                  f"matches={same}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-process AES-CTR file encryption")
+    parser.add_argument('--key', help="16, 24 or 32 bytes as hex")
+    parser.add_argument('--nonce', help="8 bytes as hex (random if omitted)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--benchmark', action='store_true')
+    parser.add_argument('--size-mb', type=int, default=256, help="benchmark file size")
+    parser.add_argument('infile', nargs='?')
+    parser.add_argument('outfile', nargs='?')
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark(args.size_mb, args.workers)
+        return
+    if not (args.key and args.infile and args.outfile):
+        parser.error("--key, infile and outfile are required")
+    nonce = bytes.fromhex(args.nonce) if args.nonce else os.urandom(NONCE_SIZE)
+    start = time.perf_counter()
+    total = ctr_file(args.infile, args.outfile, bytes.fromhex(args.key), nonce, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"nonce {nonce.hex()}: {total} bytes in {elapsed:.3f}s "
+          f"({total / max(elapsed, 1e-9) / 2**20:.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
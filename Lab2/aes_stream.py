@@ -0,0 +1,195 @@
+# Segmented AES-GCM file encryption (STREAM construction).
+#
+# The plaintext is cut into fixed-size segments and each one is sealed on its
+# own with AES-GCM. Segment i uses the nonce
+#     prefix (7 random bytes) || i (4 bytes, big-endian) || last flag (1 byte)
+# so segments cannot be reordered, dropped or truncated at a segment boundary
+# without a tag failing (an empty file still gets one empty final segment).
+# The file header is authenticated with every segment.
+#
+# File layout:
+#     MAGIC | segment size (4 bytes) | nonce prefix (7 bytes)
+#     segment 0 ciphertext | tag (16) | segment 1 ciphertext | tag | ...
+#
+# The segment size comes from the header before any tag is checked, so it is
+# capped at MAX_SEGMENT_SIZE before buffers are allocated.
+#
+# Every segment sits at a fixed offset, so any segment can be decrypted on its
+# own. Files are read with readinto into two reused segment buffers, keeping
+# memory constant; with workers, segment ranges are processed in separate
+# processes, each writing its own part of the output file.
+#
+# Usage:
+#   python aes_stream.py encrypt --key <hex> plain.bin sealed.bin [--workers 4]
+#   python aes_stream.py decrypt --key <hex> sealed.bin plain.bin
+#   python aes_stream.py segment --key <hex> sealed.bin 12 part.bin
+
+import argparse
+import os
+import time
+
+from Crypto.Cipher import AES
+
+from file_jobs import block_ranges, check_distinct, run_jobs
+
+MAGIC = b"AESGCMS1"
+PREFIX_SIZE = 7
+HEADER_SIZE = len(MAGIC) + 4 + PREFIX_SIZE
+TAG_SIZE = 16
+SEGMENT_SIZE = 64 * 1024
+MAX_SEGMENT_SIZE = 64 * 1024 * 1024  # bounds the buffers a (not yet authenticated) header can ask for
+MAX_SEGMENTS = 1 << 32
+
+
+def segment_nonce(prefix, index, last):
+    return prefix + index.to_bytes(4, 'big') + (b'\x01' if last else b'\x00')
+
+
+def segment_cipher(key, header, index, last):
+    cipher = AES.new(key, AES.MODE_GCM, nonce=segment_nonce(header[-PREFIX_SIZE:], index, last))
+    cipher.update(header)
+    return cipher
+
+
+def read_header(f):
+    header = f.read(HEADER_SIZE)
+    if len(header) != HEADER_SIZE or not header.startswith(MAGIC):
+        raise ValueError("Not a segmented AES-GCM file")
+    segment_size = int.from_bytes(header[len(MAGIC):len(MAGIC) + 4], 'big')
+    if not 0 < segment_size <= MAX_SEGMENT_SIZE:
+        raise ValueError(f"Invalid segment size {segment_size} in header")
+    return header, segment_size
+
+
+def segment_count(sealed_size, segment_size):
+    """Number of segments in a sealed file of sealed_size bytes"""
+    body = sealed_size - HEADER_SIZE
+    count = -(-body // (segment_size + TAG_SIZE))
+    if count == 0 or body - (count - 1) * (segment_size + TAG_SIZE) < TAG_SIZE:
+        raise ValueError("Sealed file is truncated")
+    return count
+
+
+def _encrypt_range(args):
+    src, dst, key, header, segment_size, n_segments, start, end = args
+    buffer, out = bytearray(segment_size), bytearray(segment_size)
+    view, out_view = memoryview(buffer), memoryview(out)
+    with open(src, 'rb') as fin, open(dst, 'r+b') as fout:
+        fin.seek(start * segment_size)
+        fout.seek(HEADER_SIZE + start * (segment_size + TAG_SIZE))
+        for i in range(start, end):
+            n = fin.readinto(buffer)
+            cipher = segment_cipher(key, header, i, i == n_segments - 1)
+            cipher.encrypt(view[:n], output=out_view[:n])
+            fout.write(out_view[:n])
+            fout.write(cipher.digest())
+
+
+def _decrypt_range(args):
+    src, dst, key, header, segment_size, n_segments, start, end = args
+    buffer, out = bytearray(segment_size + TAG_SIZE), bytearray(segment_size)
+    view, out_view = memoryview(buffer), memoryview(out)
+    with open(src, 'rb') as fin, open(dst, 'r+b') as fout:
+        fin.seek(HEADER_SIZE + start * (segment_size + TAG_SIZE))
+        fout.seek(start * segment_size)
+        for i in range(start, end):
+            n = fin.readinto(buffer) - TAG_SIZE
+            cipher = segment_cipher(key, header, i, i == n_segments - 1)
+            cipher.decrypt(view[:n], output=out_view[:n])
+            try:
+                cipher.verify(view[n:n + TAG_SIZE])
+            except ValueError:
+                raise ValueError(f"Segment {i} failed authentication") from None
+            fout.write(out_view[:n])
+
+
+def _run_ranges(job, common, n_segments, workers):
+    ranges = block_ranges(n_segments, workers or 1)
+    run_jobs(job, [common + (start, end) for start, end in ranges], workers)
+
+
+def encrypt_file(src, dst, key, segment_size=SEGMENT_SIZE, workers=None):
+    """Seal src into dst; returns the number of segments"""
+    if not 0 < segment_size <= MAX_SEGMENT_SIZE:
+        raise ValueError(f"Segment size must be 1-{MAX_SEGMENT_SIZE} bytes")
+    check_distinct(src, dst)
+    size = os.path.getsize(src)
+    n_segments = max(1, -(-size // segment_size))
+    if n_segments > MAX_SEGMENTS:
+        raise ValueError("File too large for this segment size")
+    header = MAGIC + segment_size.to_bytes(4, 'big') + os.urandom(PREFIX_SIZE)
+    with open(dst, 'wb') as f:
+        f.write(header)
+        f.truncate(HEADER_SIZE + size + n_segments * TAG_SIZE)
+    _run_ranges(_encrypt_range, (src, dst, key, header, segment_size, n_segments),
+                n_segments, workers)
+    return n_segments
+
+
+def decrypt_file(src, dst, key, workers=None):
+    """Open src into dst; raises ValueError (and removes dst) if any segment fails"""
+    check_distinct(src, dst)
+    with open(src, 'rb') as f:
+        header, segment_size = read_header(f)
+    sealed_size = os.path.getsize(src)
+    n_segments = segment_count(sealed_size, segment_size)
+    with open(dst, 'wb') as f:
+        f.truncate(sealed_size - HEADER_SIZE - n_segments * TAG_SIZE)
+    try:
+        _run_ranges(_decrypt_range, (src, dst, key, header, segment_size, n_segments),
+                    n_segments, workers)
+    except ValueError:
+        os.remove(dst)
+        raise
+    return n_segments
+
+
+def decrypt_segment(src, key, index):
+    """Decrypt and authenticate segment `index` of a sealed file"""
+    with open(src, 'rb') as f:
+        header, segment_size = read_header(f)
+        n_segments = segment_count(os.fstat(f.fileno()).st_size, segment_size)
+        if not 0 <= index < n_segments:
+            raise IndexError(f"Segment {index} out of range (0-{n_segments - 1})")
+        f.seek(HEADER_SIZE + index * (segment_size + TAG_SIZE))
+        data = f.read(segment_size + TAG_SIZE)
+    cipher = segment_cipher(key, header, index, index == n_segments - 1)
+    try:
+        return cipher.decrypt_and_verify(data[:-TAG_SIZE], data[-TAG_SIZE:])
+    except ValueError:
+        raise ValueError(f"Segment {index} failed authentication") from None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Segmented AES-GCM file encryption")
+    commands = parser.add_subparsers(dest='command', required=True)
+    for name in ('encrypt', 'decrypt', 'segment'):
+        command = commands.add_parser(name)
+        command.add_argument('--key', required=True, help="16, 24 or 32 bytes as hex")
+        command.add_argument('infile')
+        if name == 'segment':
+            command.add_argument('index', type=int)
+        command.add_argument('outfile')
+        if name != 'segment':
+            command.add_argument('--workers', type=int)
+    commands.choices['encrypt'].add_argument('--segment-size', type=int, default=SEGMENT_SIZE)
+    args = parser.parse_args(argv)
+    key = bytes.fromhex(args.key)
+
+    start = time.perf_counter()
+    if args.command == 'encrypt':
+        n = encrypt_file(args.infile, args.outfile, key, args.segment_size, args.workers)
+    elif args.command == 'decrypt':
+        n = decrypt_file(args.infile, args.outfile, key, args.workers)
+    else:
+        with open(args.outfile, 'wb') as f:
+            f.write(decrypt_segment(args.infile, key, args.index))
+        n = 1
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(args.outfile if args.command == 'segment' else args.infile)
+    print(f"{args.command}: {n} segment(s), {size} bytes in {elapsed:.3f}s "
+          f"({size / max(elapsed, 1e-9) / 2**20:.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
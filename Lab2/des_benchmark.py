@@ -0,0 +1,34 @@
+# Blocks-per-second comparison of the q1 DES implementations:
+# the original '0'/'1' string path vs the 64-bit integer core with SP tables.
+
+import os
+import time
+
+from q1 import bits_to_bytes, des_block_bits, des_block_int, des_key
+
+KEY = "A1B2C3D4"
+
+
+def timed(func, blocks):
+    start = time.perf_counter()
+    out = [func(b) for b in blocks]
+    return out, time.perf_counter() - start
+
+
+def run(n_blocks=20000):
+    blocks = [os.urandom(8) for _ in range(n_blocks)]
+    round_keys = des_key(KEY).encrypt_keys
+
+    string_out, string_t = timed(lambda b: bits_to_bytes(des_block_bits(b, KEY)), blocks)
+    int_out, int_t = timed(
+        lambda b: des_block_int(int.from_bytes(b, 'big'), round_keys).to_bytes(8, 'big'), blocks)
+
+    assert string_out == int_out, "integer core disagrees with the string implementation"
+    print(f"Blocks: {n_blocks} (byte-identical output)")
+    print(f"String DES:  {string_t:.3f}s  {n_blocks / string_t:10.0f} blocks/s")
+    print(f"Integer DES: {int_t:.3f}s  {n_blocks / int_t:10.0f} blocks/s  "
+          f"({string_t / int_t:.1f}x)")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,178 @@
+# Known-plaintext key search over a reduced DES keyspace (q1 cipher).
+#
+# The q1 key schedule only uses the first 56 key bits, so a key is a 56-bit
+# int. The search assumes all but the lowest `bits` of it are known and tries
+# every value of those bits: the keyspace is cut into fixed-size chunks that
+# are handed to a process pool. A match cancels the outstanding chunks, and
+# the finished chunk numbers are written to a JSON checkpoint so an
+# interrupted search resumes where it stopped.
+#
+# Usage:
+#   python des_keysearch.py --bits 20 --workers 4 --checkpoint search.json
+#   python des_keysearch.py --benchmark --bits 16
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from q1 import KEY_MASK, des_block, des_block_int, key_to_int, round_keys_from_int
+
+CHUNK_KEYS = 1 << 12  # keys per job; also the cancellation granularity
+
+
+def search_range(args):
+    """Try base | k for k in [start, end); returns the matching 56-bit key or None"""
+    base, start, end, plaintext, ciphertext = args
+    for k in range(start, end):
+        key56 = base | k
+        if des_block_int(plaintext, round_keys_from_int(key56)) == ciphertext:
+            return key56
+    return None
+
+
+def key_bytes(key56):
+    """The 8 key bytes a 56-bit key corresponds to (last byte is ignored by q1)"""
+    return key56.to_bytes(7, 'big') + b'\0'
+
+
+def verify(key56, plaintext, ciphertext):
+    """Re-check a found key with the q1 des_block (needs a text-encodable key)"""
+    try:
+        key = key_bytes(key56).rstrip(b'\0').decode()
+    except UnicodeDecodeError:
+        return des_block_int(int.from_bytes(plaintext, 'big'),
+                             round_keys_from_int(key56)) == int.from_bytes(ciphertext, 'big')
+    return int(des_block(plaintext, key), 2) == int.from_bytes(ciphertext, 'big')
+
+
+class Checkpoint:
+    """Finished chunk numbers (and the result) for one search, kept in a JSON file"""
+
+    def __init__(self, path, params):
+        self.path = path
+        self.params = params
+        self.done = set()
+        self.found = None
+        if path and os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+            if state["params"] != params:
+                raise ValueError(f"{path} belongs to a different search")
+            self.done = set(state["done"])
+            self.found = state["found"]
+
+    def save(self):
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"params": self.params, "done": sorted(self.done), "found": self.found}, f)
+        os.replace(tmp, self.path)
+
+
+def key_search(plaintext, ciphertext, known_key, bits, workers=None,
+               checkpoint=None, save_every=5.0):
+    """Search the low `bits` bits of a 56-bit key for plaintext -> ciphertext.
+
+    plaintext/ciphertext are 8-byte blocks, known_key is a 56-bit int whose
+    low bits are ignored. Returns (key56 or None, keys_tried, seconds)."""
+    if not 0 < bits <= 56:
+        raise ValueError("bits must be between 1 and 56")
+    base = known_key & KEY_MASK & ~((1 << bits) - 1)
+    pt, ct = int.from_bytes(plaintext, 'big'), int.from_bytes(ciphertext, 'big')
+    chunk = min(CHUNK_KEYS, 1 << bits)
+    n_chunks = (1 << bits) // chunk
+
+    state = Checkpoint(checkpoint, {"plaintext": plaintext.hex(), "ciphertext": ciphertext.hex(),
+                                    "base": base, "bits": bits, "chunk": chunk})
+    if state.found is not None:
+        return state.found, 0, 0.0
+    todo = (i for i in range(n_chunks) if i not in state.done)
+
+    def job(i):
+        return base, i * chunk, (i + 1) * chunk, pt, ct
+
+    found, tried = None, 0
+    start = last_save = time.perf_counter()
+    workers = workers or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Keep a few chunks per worker in flight so cancelling is cheap
+        pending = {}
+        for i in todo:
+            pending[pool.submit(search_range, job(i))] = i
+            if len(pending) >= 2 * workers:
+                break
+        try:
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i = pending.pop(future)
+                    result = future.result()
+                    state.done.add(i)
+                    tried += chunk
+                    if result is not None and found is None:
+                        found = result
+                if found is not None:
+                    for future in pending:
+                        future.cancel()
+                    break
+                for i in todo:
+                    pending[pool.submit(search_range, job(i))] = i
+                    if len(pending) >= 2 * workers:
+                        break
+                if time.perf_counter() - last_save >= save_every:
+                    state.save()
+                    last_save = time.perf_counter()
+        finally:
+            state.found = found
+            state.save()
+    return found, tried, time.perf_counter() - start
+
+
+def benchmark(bits=16, workers_list=None):
+    """Exhaust a keyspace with no match for increasing worker counts"""
+    workers_list = workers_list or sorted({1, 2, 4, os.cpu_count() or 1})
+    plaintext, ciphertext = os.urandom(8), os.urandom(8)
+    base_rate = None
+    print(f"Keyspace 2^{bits}, {os.cpu_count()} CPU(s)")
+    for workers in workers_list:
+        _, tried, elapsed = key_search(plaintext, ciphertext, 0, bits, workers)
+        rate = tried / elapsed
+        base_rate = base_rate or rate
+        speedup = rate / base_rate
+        print(f"{workers:3d} worker(s): {rate:10.0f} keys/s  speedup {speedup:5.2f}x  "
+              f"efficiency {speedup / workers:6.1%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reduced-keyspace known-plaintext DES search")
+    parser.add_argument("--bits", type=int, default=18, help="number of unknown key bits")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--key", default="A1B2C3D4", help="secret key for the demo")
+    parser.add_argument("--checkpoint", help="JSON file to save/resume progress")
+    parser.add_argument("--benchmark", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark(args.bits)
+        return
+
+    plaintext = b"KNOWNPT!"
+    secret = key_to_int(args.key)
+    ciphertext = int(des_block(plaintext, args.key), 2).to_bytes(8, 'big')
+    print(f"Searching 2^{args.bits} keys with {args.workers} worker(s)...")
+    found, tried, elapsed = key_search(plaintext, ciphertext, secret, args.bits,
+                                       args.workers, args.checkpoint)
+    if found is None:
+        print("No key found")
+        return
+    rate = tried / elapsed if elapsed else float('inf')
+    print(f"Key: {key_bytes(found).hex().upper()} (secret {key_bytes(secret).hex().upper()})")
+    print(f"Verified with des_block: {verify(found, plaintext, ciphertext)}")
+    print(f"Tried {tried} keys in {elapsed:.2f}s ({rate:.0f} keys/s)")
+
+
+if __name__ == "__main__":
+    main()
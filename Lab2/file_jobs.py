@@ -0,0 +1,28 @@
+# Helpers shared by the Lab2 file/block tools: splitting work into
+# contiguous ranges for a process pool, and guarding against writing a
+# file over its own input.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def block_ranges(n_blocks, parts):
+    """Split range(n_blocks) into at most `parts` contiguous (start, end) ranges"""
+    if n_blocks == 0:
+        return []
+    parts = max(1, min(parts, n_blocks))
+    step = -(-n_blocks // parts)
+    return [(start, min(start + step, n_blocks)) for start in range(0, n_blocks, step)]
+
+
+def run_jobs(func, jobs, workers):
+    if workers and workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(func, jobs))
+    return [func(job) for job in jobs]
+
+
+def check_distinct(src, dst):
+    """Raise ValueError if dst is src: opening dst for writing would wipe the input"""
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise ValueError("Input and output must be different files")
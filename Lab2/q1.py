@@ -1,4 +1,5 @@
 import binascii
+from functools import lru_cache
 
 # Initial permutation table
 IP = [58, 50, 42, 34, 26, 18, 10, 2,
@@ -120,8 +121,8 @@ def generate_round_keys(key):
         round_keys.append(rotated[:48])
     return round_keys
 
-# DES encryption/decryption for one 64-bit block
-def des_block(block, key, encrypt=True):
+# Reference DES block on '0'/'1' strings (kept to validate the integer core)
+def des_block_bits(block, key, encrypt=True):
     block_bits = text_to_bits(block)
     block_bits = permute(block_bits, IP)
     left, right = block_bits[:32], block_bits[32:]
@@ -137,6 +138,105 @@ def des_block(block, key, encrypt=True):
     combined = right + left
     return permute(combined, FP)
 
+# ---------- Integer core ----------
+# Blocks are 64-bit ints (bit 1 of the tables = most significant bit).
+# Permutations are applied a byte at a time: table[i][v] holds the output
+# bits contributed by value v in input byte i, so a permutation is 8 (or 4)
+# lookups OR-ed together.
+def permutation_tables(table, in_bits):
+    out_bits = len(table)
+    tables = []
+    for chunk in range(in_bits // 8):
+        entries = []
+        for value in range(256):
+            out = 0
+            for j, src in enumerate(table):
+                pos = src - 1 - chunk * 8
+                if 0 <= pos < 8 and value >> (7 - pos) & 1:
+                    out |= 1 << (out_bits - 1 - j)
+            entries.append(out)
+        tables.append(entries)
+    return tables
+
+# SP[i][v]: S-box i applied to 6-bit value v, placed in its 4-bit slot and
+# passed through P, so the round function is 8 lookups after E and the key XOR
+def sp_tables():
+    p_tables = permutation_tables(P, 32)
+    tables = []
+    for i in range(8):
+        entries = []
+        for v in range(64):
+            row = (v >> 4 & 2) | (v & 1)
+            col = v >> 1 & 15
+            s_out = S_boxes[i][row][col] << (28 - 4 * i)
+            entries.append(p_tables[0][s_out >> 24 & 255] | p_tables[1][s_out >> 16 & 255] |
+                           p_tables[2][s_out >> 8 & 255] | p_tables[3][s_out & 255])
+        tables.append(entries)
+    return tables
+
+IP_TABLES = permutation_tables(IP, 64)
+FP_TABLES = permutation_tables(FP, 64)
+E_TABLES = permutation_tables(E, 32)
+SP = sp_tables()
+
+def permute64(x, tables):
+    t0, t1, t2, t3, t4, t5, t6, t7 = tables
+    return (t0[x >> 56] | t1[x >> 48 & 255] | t2[x >> 40 & 255] | t3[x >> 32 & 255] |
+            t4[x >> 24 & 255] | t5[x >> 16 & 255] | t6[x >> 8 & 255] | t7[x & 255])
+
+def des_block_int(block, round_keys):
+    """One DES block on a 64-bit int with round keys as 48-bit ints (in order)"""
+    e0, e1, e2, e3 = E_TABLES
+    s0, s1, s2, s3, s4, s5, s6, s7 = SP
+    x = permute64(block, IP_TABLES)
+    left, right = x >> 32, x & 0xFFFFFFFF
+    for rk in round_keys:
+        e = (e0[right >> 24] | e1[right >> 16 & 255] | e2[right >> 8 & 255] | e3[right & 255]) ^ rk
+        f = (s0[e >> 42] | s1[e >> 36 & 63] | s2[e >> 30 & 63] | s3[e >> 24 & 63] |
+             s4[e >> 18 & 63] | s5[e >> 12 & 63] | s6[e >> 6 & 63] | s7[e & 63])
+        left, right = right, left ^ f
+    return permute64(right << 32 | left, FP_TABLES)
+
+# generate_round_keys on a 56-bit int: round i is the key rotated left by i,
+# top 48 bits
+KEY_MASK = (1 << 56) - 1
+
+def key_to_int(key):
+    return int.from_bytes(key.encode().ljust(8, b'\0')[:7], 'big')
+
+def round_keys_from_int(key56):
+    return tuple(((key56 << i | key56 >> (56 - i)) & KEY_MASK) >> 8 for i in range(16))
+
+# Key object: both round-key schedules are derived once
+class DESKey:
+    def __init__(self, key):
+        self.key = key
+        self.encrypt_keys = round_keys_from_int(key_to_int(key))
+        self.decrypt_keys = self.encrypt_keys[::-1]
+
+    def round_keys(self, encrypt=True):
+        return self.encrypt_keys if encrypt else self.decrypt_keys
+
+    def encrypt_block(self, block):
+        return des_block_int(block, self.encrypt_keys)
+
+    def decrypt_block(self, block):
+        return des_block_int(block, self.decrypt_keys)
+
+# Schedules for raw key strings, bounded LRU
+@lru_cache(maxsize=256)
+def _cached_key(key):
+    return DESKey(key)
+
+def des_key(key):
+    """DESKey for a key string (cached) or an existing DESKey"""
+    return key if isinstance(key, DESKey) else _cached_key(key)
+
+# DES encryption/decryption for one 64-bit block (returns the bit string)
+def des_block(block, key, encrypt=True):
+    result = des_block_int(int.from_bytes(block, 'big'), des_key(key).round_keys(encrypt))
+    return format(result, '064b')
+
 # Pad plaintext to multiple of 8 bytes
 def pad(data):
     pad_len = 8 - (len(data) % 8)
@@ -148,32 +248,35 @@ def unpad(data):
     pad_len = data[-1]
     return data[:-pad_len]
 
-# DES encrypt
+BITSLICE_THRESHOLD = 1024  # bytes; larger inputs use the NumPy bitsliced core
+
 
+def des_ecb(data, round_keys):
+    """ECB over whole blocks: bitsliced for large inputs, the int core otherwise"""
+    if len(data) >= BITSLICE_THRESHOLD:
+        # Imported here: des_bitslice imports this module and needs NumPy
+        from des_bitslice import des_ecb_bitsliced
+        return des_ecb_bitsliced(data, round_keys)
+    return b''.join(
+        des_block_int(int.from_bytes(data[i:i+8], 'big'), round_keys).to_bytes(8, 'big')
+        for i in range(0, len(data), 8))
+
+# DES encrypt
 def des_encrypt(plaintext, key):
-    data = pad(plaintext.encode())
-    result = b''
-    for i in range(0, len(data), 8):
-        block = data[i:i+8]
-        encrypted_bits = des_block(block, key, True)
-        result += bits_to_bytes(encrypted_bits)
-    return result
+    return des_ecb(pad(plaintext.encode()), des_key(key).encrypt_keys)
 
 # DES decrypt
 def des_decrypt(ciphertext, key):
-    result = b''
-    for i in range(0, len(ciphertext), 8):
-        block = ciphertext[i:i+8]
-        decrypted_bits = des_block(block, key, False)
-        result += bits_to_bytes(decrypted_bits)
+    result = des_ecb(ciphertext, des_key(key).decrypt_keys)
     return unpad(result).decode(errors='ignore')
 
 # Test
-plaintext = input("Enter plain text: ")
-key = "A1B2C3D4"
+if __name__ == "__main__":
+    plaintext = input("Enter plain text: ")
+    key = "A1B2C3D4"
 
-cipher = des_encrypt(plaintext, key)
-print("Ciphertext (hex):", cipher.hex().upper())
+    cipher = des_encrypt(plaintext, key)
+    print("Ciphertext (hex):", cipher.hex().upper())
 
-decrypted = des_decrypt(cipher, key)
-print("Decrypted text:", decrypted)
+    decrypted = des_decrypt(cipher, key)
+    print("Decrypted text:", decrypted)
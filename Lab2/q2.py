@@ -1,6 +1,9 @@
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import pad, unpad
 import binascii
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.cipher_cache import cipher_context
 
 # AES-128 key (16 bytes = 128 bits)
 key = bytes.fromhex("0123456789ABCDEF0123456789ABCDEF")
@@ -8,13 +11,13 @@ key = bytes.fromhex("0123456789ABCDEF0123456789ABCDEF")
 # AES requires block size of 16 bytes
 plaintext = "Sensitive Information".encode()
 
-# Create AES cipher in ECB mode
-cipher = AES.new(key, AES.MODE_ECB)
+# AES cipher in ECB mode (expanded key cached in common/cipher_cache.py)
+cipher = cipher_context("AES", key)
 
 # Encrypt with padding
-ciphertext = cipher.encrypt(pad(plaintext, AES.block_size))
+_, ciphertext = cipher.encrypt(plaintext, mode="ECB")
 print("Ciphertext (hex):", binascii.hexlify(ciphertext).upper().decode())
 
 # Decrypt
-decrypted = unpad(cipher.decrypt(ciphertext), AES.block_size)
+decrypted = cipher.decrypt(b"", ciphertext, mode="ECB")
 print("Decrypted text:", decrypted.decode())
@@ -1,42 +1,211 @@
+# Benchmark harness for the Lab2 symmetric ciphers.
+#
+# Compares DES, 3DES (q4), AES-128/192/256 (q2, q5, and the AES-256 key this
+# file always used) and the hand-written DES of q1 in ECB/CBC/CTR/GCM, for
+# messages from 16 B to 256 MB. Each timed operation includes creating the
+# cipher object, as a real per-message encryption would. Small messages are
+# run many times per sample so a sample lasts at least 20 ms; every
+# sample is measured with perf_counter_ns after warmup runs, and the median
+# (per operation, over samples) and MB/s from it are reported. Each call in a
+# sample is also timed on its own, and p95 is taken over those single-call
+# times; with fewer than MIN_PERCENTILE_CALLS of them (the largest messages)
+# there is no meaningful p95 and none is reported. Results can be written as
+# JSON and/or CSV for trend tracking.
+#
+# DES and 3DES have 64-bit blocks, so there is no GCM for them; the q1 DES
+# is pure Python and stops at --custom-max-size unless raised.
+#
+# Usage:
+#   python q3.py --max-size 1MB --json results.json --csv results.csv
+#   python q3.py --algorithms aes128 aes256 --modes CTR GCM --sizes 16MB 256MB
+
+import argparse
+import csv
+import json
+import math
+import os
+import platform
+import statistics
 import time
-import binascii
-from Crypto.Cipher import DES, AES
+from datetime import datetime
+
+import Crypto
+from Crypto.Cipher import AES, DES, DES3
 from Crypto.Util.Padding import pad, unpad
 
-# Test message
-message = b"Performance Testing of Encryption Algorithms"
+import q1
+import des_modes
+
+SIZES = {"16B": 16, "256B": 256, "4KB": 4 << 10, "64KB": 64 << 10,
+         "1MB": 1 << 20, "16MB": 16 << 20, "256MB": 256 << 20}
+MODES = ["ECB", "CBC", "CTR", "GCM"]
+MIN_SAMPLE_NS = 20_000_000  # fast operations are repeated to fill a sample
+MIN_PERCENTILE_CALLS = 20   # fewer single-call times give no p95
+
+LIBRARY = {
+    "des": (DES, b"8bytekey"),
+    "3des": (DES3, DES3.adjust_key_parity(bytes.fromhex(
+        "0123456789ABCDEFFEDCBA987654321089ABCDEF01234567"))),
+    "aes128": (AES, bytes.fromhex("0123456789ABCDEF0123456789ABCDEF")),
+    "aes192": (AES, bytes.fromhex("FEDCBA9876543210FEDCBA9876543210FEDCBA9876543210")),
+    "aes256": (AES, b"0123456789ABCDEF0123456789ABCDEF"),
+}
+CUSTOM_KEY = "A1B2C3D4"
+ALGORITHMS = list(LIBRARY) + ["custom-des"]
+
+
+def library_ops(module, key, mode):
+    """(encrypt, decrypt) for a pycryptodome cipher, or None if unsupported"""
+    bs = module.block_size
+    iv = bytes(range(bs))
+    if mode == "ECB":
+        return (lambda m: module.new(key, module.MODE_ECB).encrypt(pad(m, bs)),
+                lambda c: unpad(module.new(key, module.MODE_ECB).decrypt(c), bs))
+    if mode == "CBC":
+        return (lambda m: module.new(key, module.MODE_CBC, iv=iv).encrypt(pad(m, bs)),
+                lambda c: unpad(module.new(key, module.MODE_CBC, iv=iv).decrypt(c), bs))
+    if mode == "CTR":
+        nonce = iv[:bs // 2]
+        return (lambda m: module.new(key, module.MODE_CTR, nonce=nonce).encrypt(m),
+                lambda c: module.new(key, module.MODE_CTR, nonce=nonce).decrypt(c))
+    if mode == "GCM" and bs == 16:
+        nonce = iv[:12]
+        return (lambda m: module.new(key, module.MODE_GCM, nonce=nonce).encrypt_and_digest(m),
+                lambda c: module.new(key, module.MODE_GCM, nonce=nonce).decrypt_and_verify(*c))
+    return None
+
+
+def custom_ops(mode):
+    """(encrypt, decrypt) for the q1 DES, or None if unsupported"""
+    key = q1.des_key(CUSTOM_KEY)
+    iv = bytes(range(8))
+    if mode == "ECB":
+        return (lambda m: q1.des_ecb(q1.pad(m), key.encrypt_keys),
+                lambda c: q1.unpad(q1.des_ecb(c, key.decrypt_keys)))
+    if mode == "CBC":
+        return (lambda m: des_modes.cbc_encrypt(m, key, iv),
+                lambda c: des_modes.cbc_decrypt(c, key, iv))
+    if mode == "CTR":
+        return (lambda m: des_modes.ctr_crypt(m, key, iv),
+                lambda c: des_modes.ctr_crypt(c, key, iv))
+    return None
+
+
+def cipher_ops(algorithm, mode):
+    if algorithm == "custom-des":
+        return custom_ops(mode)
+    return library_ops(*LIBRARY[algorithm], mode)
+
+
+def percentile(values, q):
+    """Nearest-rank percentile: the smallest value with at least q of values <= it"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def measure(func, arg, size, warmup, repeats):
+    """Per-operation times (ns) of func(arg); returns median, p95 (or None), MB/s"""
+    single = None
+    for _ in range(max(1, warmup)):
+        start = time.perf_counter_ns()
+        func(arg)
+        single = time.perf_counter_ns() - start
+    number = max(1, MIN_SAMPLE_NS // max(single, 1))
+    samples, calls = [], []
+    for _ in range(repeats):
+        start = last = time.perf_counter_ns()
+        for _ in range(number):
+            func(arg)
+            now = time.perf_counter_ns()
+            calls.append(now - last)
+            last = now
+        samples.append((last - start) / number)
+    median = statistics.median(samples)
+    return {
+        "median_ns": median,
+        "p95_ns": percentile(calls, 0.95) if len(calls) >= MIN_PERCENTILE_CALLS else None,
+        "mb_per_s": size / 2 ** 20 / (median / 1e9) if median else float('inf'),
+        "ops_per_sample": number,
+        "samples": len(samples),
+        "calls": len(calls),
+    }
+
+
+def run(algorithms, modes, sizes, warmup=2, repeats=10, custom_max=SIZES["64KB"]):
+    rows = []
+    for size_name in sizes:
+        size = SIZES[size_name]
+        message = os.urandom(size)
+        # Fewer repeats for the big inputs keeps a full run in minutes
+        reps = repeats if size <= SIZES["1MB"] else max(3, repeats // 3)
+        for algorithm in algorithms:
+            if algorithm == "custom-des" and size > custom_max:
+                continue
+            for mode in modes:
+                ops = cipher_ops(algorithm, mode)
+                if ops is None:
+                    continue
+                encrypt, decrypt = ops
+                blob = encrypt(message)
+                if decrypt(blob) != message:
+                    raise AssertionError(f"{algorithm} {mode} does not round-trip")
+                for op, func, arg in (("encrypt", encrypt, message), ("decrypt", decrypt, blob)):
+                    r = measure(func, arg, size, warmup, reps)
+                    row = {"algorithm": algorithm, "mode": mode, "op": op,
+                           "size": size_name, "bytes": size, **r}
+                    rows.append(row)
+                    p95 = f"{r['p95_ns'] / 1e3:12.1f} us" if r["p95_ns"] is not None else f"{'-':>15}"
+                    print(f"{algorithm:<10} {mode:<3} {op:<7} {size_name:>5}: "
+                          f"median {r['median_ns'] / 1e3:12.1f} us  p95 {p95}  "
+                          f"{r['mb_per_s']:9.2f} MB/s")
+        del message
+    return rows
 
-# --- DES Setup ---
-des_key = b"8bytekey"        # DES requires 8-byte key
-des_cipher = DES.new(des_key, DES.MODE_ECB)
 
-# --- AES-256 Setup ---
-aes_key = b"0123456789ABCDEF0123456789ABCDEF"  # 32-byte key (256 bits)
-aes_cipher = AES.new(aes_key, AES.MODE_ECB)
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
 
-# --- DES Timing ---
-start = time.time()
-des_encrypted = des_cipher.encrypt(pad(message, DES.block_size))
-des_encrypt_time = time.time() - start
 
-start = time.time()
-des_decrypted = unpad(des_cipher.decrypt(des_encrypted), DES.block_size)
-des_decrypt_time = time.time() - start
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Lab2 symmetric ciphers")
+    parser.add_argument("--algorithms", nargs="+", choices=ALGORITHMS, default=ALGORITHMS)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--max-size", choices=list(SIZES))
+    parser.add_argument("--custom-max-size", choices=list(SIZES), default="64KB",
+                        help="largest message for the pure-Python q1 DES")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--csv", help="write results to this file")
+    args = parser.parse_args(argv)
 
-# --- AES-256 Timing ---
-start = time.time()
-aes_encrypted = aes_cipher.encrypt(pad(message, AES.block_size))
-aes_encrypt_time = time.time() - start
+    sizes = args.sizes
+    if args.max_size:
+        sizes = [s for s in sizes if SIZES[s] <= SIZES[args.max_size]]
 
-start = time.time()
-aes_decrypted = unpad(aes_cipher.decrypt(aes_encrypted), AES.block_size)
-aes_decrypt_time = time.time() - start
+    rows = run(args.algorithms, args.modes, sizes, args.warmup, args.repeats,
+               SIZES[args.custom_max_size])
+    if args.json:
+        report = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pycryptodome": Crypto.__version__,
+            "machine": platform.machine(),
+            "warmup": args.warmup,
+            "repeats": args.repeats,
+            "results": rows,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    if args.csv and rows:
+        write_csv(args.csv, rows)
+        print(f"Results written to {args.csv}")
 
-# --- Results ---
-print("DES Encryption Time:   {:.6f} sec".format(des_encrypt_time))
-print("DES Decryption Time:   {:.6f} sec".format(des_decrypt_time))
-print("AES-256 Encryption Time: {:.6f} sec".format(aes_encrypt_time))
-print("AES-256 Decryption Time: {:.6f} sec".format(aes_decrypt_time))
 
-print("\nDES Decrypted Message: ", des_decrypted.decode())
-print("AES Decrypted Message: ", aes_decrypted.decode())
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
 from Crypto.Cipher import DES3
-from Crypto.Util.Padding import pad, unpad
 from Crypto.Random import get_random_bytes
 import binascii
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.cipher_cache import cipher_context
 
 plaintext = b"Classified Text"
 
@@ -9,9 +13,9 @@ plaintext = b"Classified Text"
 key = DES3.adjust_key_parity(get_random_bytes(24))
 print("Key (hex):", binascii.hexlify(key).upper().decode())
 
-cipher = DES3.new(key, DES3.MODE_ECB)
-ciphertext = cipher.encrypt(pad(plaintext, DES3.block_size))
+cipher = cipher_context("DES3", key)
+_, ciphertext = cipher.encrypt(plaintext, mode="ECB")
 print("Ciphertext (hex):", binascii.hexlify(ciphertext).upper().decode())
 
-decrypted = unpad(cipher.decrypt(ciphertext), DES3.block_size)
+decrypted = cipher.decrypt(b"", ciphertext, mode="ECB")
 print("Decrypted text:", decrypted.decode())
@@ -1,21 +1,24 @@
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import pad
 import binascii
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.cipher_cache import cipher_context
 
 # AES parameters
 plaintext = b"Top Secret Data"
 key_hex = "FEDCBA9876543210FEDCBA9876543210FEDCBA9876543210"  # 192-bit key
 key = bytes.fromhex(key_hex)
 
-# Create AES-192 cipher (ECB)
-cipher = AES.new(key, AES.MODE_ECB)
+# AES-192 cipher (ECB), expanded key cached in common/cipher_cache.py
+cipher = cipher_context("AES", key)
 
 # Encrypt
-ciphertext = cipher.encrypt(pad(plaintext, AES.block_size))
+_, ciphertext = cipher.encrypt(plaintext, mode="ECB")
 print("Plaintext:", plaintext.decode())
 print("Key (192-bit):", key_hex)
 print("Ciphertext (hex):", binascii.hexlify(ciphertext).upper().decode())
 
-# Decrypt
-decrypted = cipher.decrypt(ciphertext).decode().rstrip("\x04")  # unpad manually
+# Decrypt (PKCS#7 unpadding)
+decrypted = cipher.decrypt(b"", ciphertext, mode="ECB").decode()
 print("Decrypted:", decrypted)
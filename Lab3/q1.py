@@ -1,4 +1,9 @@
-import random
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.primes import is_probable_prime, random_prime
+from common.rsa import generate_private_key, make_private_key, private_power_batch
 
 # Fast modular exponentiation
 def power(base, exp, mod):
@@ -29,40 +34,13 @@ def modinverse(e, phi):
         raise Exception("Modular inverse does not exist")
     return x % phi
 
-# Check primality (basic Miller-Rabin)
+# Check primality (small-prime trial division + Miller-Rabin, common/primes.py)
 def is_prime(n, k=5):
-    if n < 2:
-        return False
-    if n in [2, 3]:
-        return True
-    if n % 2 == 0:
-        return False
-
-    # write n-1 as 2^r * d
-    r, d = 0, n - 1
-    while d % 2 == 0:
-        r += 1
-        d //= 2
-
-    for _ in range(k):
-        a = random.randrange(2, n - 1)
-        x = power(a, d, n)
-        if x == 1 or x == n - 1:
-            continue
-        for _ in range(r - 1):
-            x = power(x, 2, n)
-            if x == n - 1:
-                break
-        else:
-            return False
-    return True
-
-# Generate prime of given bit length
+    return is_probable_prime(n, rounds=k)
+
+# Generate prime of exactly the given bit length (sieved search, common/primes.py)
 def generate_prime(bits=16):
-    while True:
-        p = random.getrandbits(bits)
-        if is_prime(p):
-            return p
+    return random_prime(bits)
 
 # Generate RSA keypair
 def generate_key(bits=16):
@@ -76,7 +54,15 @@ def generate_key(bits=16):
     if gcd(e, phi) != 1:
         e = 3
     d = modinverse(e, phi)
-    return (n, e), (n, d)
+    # Private key keeps p, q, dp, dq, qinv for CRT decryption (key[0], key[1] are n, d)
+    return (n, e), make_private_key(p, q, d)
+
+# Multi-prime RSA keypair: modulus_bits split over n_primes (2-4) primes.
+# Same (n, e) public key; decryption runs CRT over every factor
+def generate_multiprime_key(modulus_bits=3072, n_primes=3):
+    e = 65537
+    private_key = generate_private_key(modulus_bits, n_primes, e)
+    return (private_key.n, e), private_key
 
 # Split message into chunks (each < n)
 def chunk_message(msg, n):
@@ -88,14 +74,19 @@ def chunk_message(msg, n):
 # Encrypt each chunk
 def encrypt_chunk(chunks, pubkey):
     n, e = pubkey
-    return [power(c, e, n) for c in chunks]
+    return [pow(c, e, n) for c in chunks]
+
+# Decrypt many chunks to ints (CRT with the builtin pow; optional process pool)
+def decrypt_batch(cipher_chunks, privkey, workers=None):
+    return private_power_batch(cipher_chunks, privkey, workers)
 
 # Decrypt each chunk
-def decrypt_chunk(cipher_chunks, privkey):
-    n, d = privkey
+def decrypt_chunk(cipher_chunks, privkey, workers=None):
+    n = privkey[0]
+    size = (n.bit_length() + 7) // 8
     msg_bytes = b''.join(
-        (power(c, d, n)).to_bytes((n.bit_length() + 7) // 8, 'big').lstrip(b'\x00')
-        for c in cipher_chunks
+        m.to_bytes(size, 'big').lstrip(b'\x00')
+        for m in decrypt_batch(cipher_chunks, privkey, workers)
     )
     return msg_bytes.decode()
 
@@ -1,4 +1,10 @@
+import os
 import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.fixed_base import fixed_base
+from common.groups import MODP_2048, MODP_2048_G
 
 # --- Helper functions ---
 def power(base, exp, mod):
@@ -19,36 +25,81 @@ def gcd(a, b):
 
 def mod_inverse(a, m):
     """Return modular inverse of a under modulo m."""
-    for x in range(1, m):
-        if (a * x) % m == 1:
-            return x
-    return None
+    try:
+        return pow(a, -1, m)
+    except ValueError:
+        return None
+
+def batch_inverse(values, m):
+    """Inverses of all values mod m with one pow(..., -1, m) (Montgomery's trick)."""
+    prefix = []
+    acc = 1
+    for v in values:
+        prefix.append(acc)
+        acc = acc * v % m
+    inv = pow(acc, -1, m)
+    out = [0] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        out[i] = inv * prefix[i] % m     # (v_0 ... v_i)^-1 * (v_0 ... v_{i-1})
+        inv = inv * values[i] % m
+    return out
 
 # --- ElGamal Key Generation ---
-def generate_keys():
-    p = 30803                # prime modulus
-    g = 2                    # generator
+def generate_keys(p=30803, g=2):
+    # p: prime modulus, g: generator (MODP_2048 / MODP_2048_G for block packing)
     x = random.randint(2, p-2)   # private key
-    h = power(g, x, p)       # h = g^x mod p
+    h = fixed_base(g, p).pow(x)  # h = g^x mod p
     return (p, g, h), x      # (public key), private key
 
 # --- Encryption ---
 def encrypt(msg, public_key):
     p, g, h = public_key
     y = random.randint(1, p-2)          # random y
-    c1 = power(g, y, p)                 # c1 = g^y mod p
+    c1 = fixed_base(g, p).pow(y)        # c1 = g^y mod p (precomputed powers of g)
     s = power(h, y, p)                  # s = h^y mod p
     ciphertext = [(c1, (ord(ch) * s) % p) for ch in msg]
     return ciphertext
 
 # --- Decryption ---
+def decrypt_batch(ciphertext, private_key, p):
+    """Plaintext group elements for a list of (c1, c2) pairs."""
+    secrets = {}                                # s = c1^x mod p, once per distinct c1
+    for c1, _ in ciphertext:
+        if c1 not in secrets:
+            secrets[c1] = pow(c1, private_key, p)
+    inverses = dict(zip(secrets, batch_inverse(list(secrets.values()), p)))
+    return [(c2 * inverses[c1]) % p for c1, c2 in ciphertext]
+
 def decrypt(ciphertext, private_key, p):
-    decrypted = ""
-    for c1, c2 in ciphertext:
-        s = power(c1, private_key, p)       # s = c1^x mod p
-        s_inv = mod_inverse(s, p)           # modular inverse
-        decrypted += chr((c2 * s_inv) % p)  # recover message
-    return decrypted
+    return "".join(chr(m) for m in decrypt_batch(ciphertext, private_key, p))
+
+# --- Block-packed ElGamal (large p) ---
+# Each group element carries block_size(p) - 1 message bytes behind a 0x01
+# marker byte (so leading zero bytes survive), with a fresh y per block.
+def block_size(p):
+    return (p.bit_length() - 1) // 8            # bytes that always fit below p
+
+def encrypt_bytes(data, public_key):
+    p, g, h = public_key
+    payload = block_size(p) - 1
+    if payload < 1:
+        raise ValueError("p is too small for block packing")
+    g_pow = fixed_base(g, p).pow
+    ciphertext = []
+    for i in range(0, len(data), payload):
+        m = int.from_bytes(b"\x01" + data[i:i + payload], 'big')
+        y = random.randint(1, p-2)
+        ciphertext.append((g_pow(y), m * pow(h, y, p) % p))
+    return ciphertext
+
+def decrypt_bytes(ciphertext, private_key, p):
+    blocks = []
+    for m in decrypt_batch(ciphertext, private_key, p):
+        block = m.to_bytes((m.bit_length() + 7) // 8, 'big')
+        if not block or block[0] != 1:
+            raise ValueError("Invalid ciphertext block")
+        blocks.append(block[1:])
+    return b"".join(blocks)
 
 # --- Demo ---
 if __name__ == "__main__":
@@ -62,3 +113,11 @@ if __name__ == "__main__":
 
     decrypted_msg = decrypt(ciphertext, private_key2, public_key2[0])
     print("\nDecrypted:", decrypted_msg)
+
+    # Block packing in the 2048-bit group: 254 bytes per ciphertext pair
+    public_key3, private_key3 = generate_keys(MODP_2048, MODP_2048_G)
+    document = ("Confidential Data " * 100).encode()
+    packed = encrypt_bytes(document, public_key3)
+    print(f"\n{len(document)} bytes -> {len(packed)} ciphertext pairs "
+          f"(vs {len(document)} one per character)")
+    print("Block-packed round trip:", decrypt_bytes(packed, private_key3, MODP_2048) == document)
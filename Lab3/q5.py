@@ -1,28 +1,52 @@
+import os
 import random
+import statistics
+import sys
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.fixed_base import FixedBase, fixed_base
+from common.groups import MODP_2048, MODP_2048_G
+
 # A 2048-bit safe prime (RFC 3526 Group 14)
-p = int(
-    "FFFFFFFFFFFFFFFFC90FDAA22168C234C4C6628B80DC1CD1"
-    "29024E088A67CC74020BBEA63B139B22514A08798E3404DD"
-    "EF9519B3CD3A431B302B0A6DF25F14374FE1356D6D51C245"
-    "E485B576625E7EC6F44C42E9A63A36210000000000090563", 16
-)
+p = MODP_2048
 
-g = 2  # generator (commonly 2 for DH)
+g = MODP_2048_G  # generator (commonly 2 for DH)
 
 def generate_private_key(p):
     # Private key: random number < p
     return random.randint(2, p - 2)
 
 def generate_public_key(private_key, g, p):
-    return pow(g, private_key, p)
+    # g^x from the precomputed powers of g (common/fixed_base.py)
+    return fixed_base(g, p).pow(private_key)
 
 def compute_shared_secret(peer_public, private_key, p):
     return pow(peer_public, private_key, p)
 
+def benchmark(count=50):
+    """Public keys per second: builtin pow vs the fixed-base table."""
+    start = time.perf_counter()
+    FixedBase(g, p)                                 # loads the table saved by fixed_base
+    setup = time.perf_counter() - start
+    keys = [generate_private_key(p) for _ in range(count)]
+    timings = {}
+    for name, func in (("pow", lambda x: pow(g, x, p)),
+                       ("fixed-base", lambda x: generate_public_key(x, g, p))):
+        samples = []
+        for x in keys:
+            start = time.perf_counter()
+            func(x)
+            samples.append(time.perf_counter() - start)
+        timings[name] = statistics.median(samples)
+    assert all(pow(g, x, p) == generate_public_key(x, g, p) for x in keys[:5])
+    print(f"\n{p.bit_length()}-bit group, {count} public keys (table load {setup * 1e3:.1f} ms):")
+    for name, t in timings.items():
+        print(f"  {name:10s} {t * 1e3:8.3f} ms/key  {1 / t:8.1f} keys/s")
+    print(f"  speedup    {timings['pow'] / timings['fixed-base']:.1f}x")
+
 # ---- Simulation ----
-start_time = time.time()
+start_time = time.perf_counter()
 
 # Peer A
 a_private = generate_private_key(p)
@@ -36,10 +60,13 @@ b_public = generate_public_key(b_private, g, p)
 shared_secret_A = compute_shared_secret(b_public, a_private, p)
 shared_secret_B = compute_shared_secret(a_public, b_private, p)
 
-end_time = time.time()
+end_time = time.perf_counter()
 
 print("Prime size (bits):", p.bit_length())
 print("Peer A Public (first 50 digits):", str(a_public)[:50], "...")
 print("Peer B Public (first 50 digits):", str(b_public)[:50], "...")
 print("Shared Secret Match?", shared_secret_A == shared_secret_B)
 print("Time taken: {:.6f} seconds".format(end_time - start_time))
+
+if __name__ == "__main__":
+    benchmark()
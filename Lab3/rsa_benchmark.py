@@ -0,0 +1,66 @@
+# RSA private-operation timings for the q1 RSA: the pure-Python power(),
+# the builtin pow with the full d, and CRT decryption with the key's factors.
+# run_multiprime compares two-prime CRT with 3- and 4-prime keys of the same
+# modulus size (keygen time and decryptions/s).
+
+import random
+import statistics
+import time
+
+from q1 import (decrypt_batch, gcd, generate_multiprime_key, generate_prime, make_private_key,
+                modinverse, power)
+
+E = 65537
+
+
+def make_key(bits):
+    while True:
+        p, q = generate_prime(bits // 2), generate_prime(bits // 2)
+        phi = (p - 1) * (q - 1)
+        if p != q and gcd(E, phi) == 1:
+            return make_private_key(p, q, modinverse(E, phi))
+
+
+def timed(func, values):
+    start = time.perf_counter()
+    out = func(values)
+    return out, time.perf_counter() - start
+
+
+def run(sizes=(1024, 2048, 3072), n_chunks=50):
+    for bits in sizes:
+        key = make_key(bits)
+        chunks = [random.randrange(key.n) for _ in range(n_chunks)]
+        results = {}
+        results["power()"] = timed(lambda cs: [power(c, key.d, key.n) for c in cs], chunks)
+        results["pow(c, d, n)"] = timed(lambda cs: [pow(c, key.d, key.n) for c in cs], chunks)
+        results["CRT"] = timed(lambda cs: decrypt_batch(cs, key), chunks)
+
+        expected = results["pow(c, d, n)"][0]
+        base = results["pow(c, d, n)"][1]
+        for label, (out, t) in results.items():
+            assert out == expected, f"{label} disagrees"
+            print(f"{bits}-bit {label:<13} {n_chunks / t:9.1f} decryptions/s  "
+                  f"{base / t:5.2f}x vs pow")
+
+
+def run_multiprime(sizes=(2048, 3072, 4096), prime_counts=(2, 3, 4), n_chunks=50, keygens=5):
+    for bits in sizes:
+        base = None
+        for k in prime_counts:
+            # Prime search time is very uneven, so keygen is a median
+            keys = [timed(lambda _: generate_multiprime_key(bits, k), None) for _ in range(keygens)]
+            keygen_t = statistics.median(t for _, t in keys)
+            (n, e), key = keys[0][0]
+            messages = [random.randrange(n) for _ in range(n_chunks)]
+            chunks = [pow(m, e, n) for m in messages]  # plain (n, e) public key
+            out, t = timed(lambda cs: decrypt_batch(cs, key), chunks)
+            assert out == messages, f"{k}-prime decryption failed"
+            base = base or t
+            print(f"{bits}-bit {k} primes: keygen {keygen_t:6.2f}s (median)  "
+                  f"{n_chunks / t:8.1f} decryptions/s  {base / t:5.2f}x vs 2 primes")
+
+
+if __name__ == "__main__":
+    run()
+    run_multiprime()
@@ -1,46 +1,22 @@
-import random
-import time
+import os
+import sys
 import logging
 from datetime import datetime, timedelta
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.primes import is_probable_prime, random_prime
+
 # ---------------- Logging Setup ----------------
 logging.basicConfig(filename="key_mgmt.log", level=logging.INFO, format="%(asctime)s - %(message)s")
 logging.getLogger().addHandler(logging.StreamHandler())  # also show logs on console
 
-# ---------------- Fast Prime Test (Miller-Rabin) ----------------
+# ---------------- Prime Test / Generation (common/primes.py) ----------------
 def is_prime(n, k=10):  # k = number of rounds
-    if n < 2:
-        return False
-    if n in (2, 3):
-        return True
-    if n % 2 == 0:
-        return False
-
-    # write n-1 as 2^r * d
-    r, d = 0, n - 1
-    while d % 2 == 0:
-        r += 1
-        d //= 2
-
-    for _ in range(k):
-        a = random.randrange(2, n - 1)
-        x = pow(a, d, n)
-        if x == 1 or x == n - 1:
-            continue
-        for _ in range(r - 1):
-            x = pow(x, 2, n)
-            if x == n - 1:
-                break
-        else:
-            return False
-    return True
+    return is_probable_prime(n, rounds=k)
 
 def generate_large_prime(bits=512):
-    """Generate a prime of given bit size"""
-    while True:
-        candidate = random.getrandbits(bits) | 1 | (1 << (bits - 1))
-        if is_prime(candidate):
-            return candidate
+    """Generate a prime of given bit size (top bit set, sieved candidates)"""
+    return random_prime(bits)
 
 # ---------------- Rabin Key Pair ----------------
 def rabin_keygen(bits=1024):
@@ -1,4 +1,9 @@
-import random
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.primes import is_probable_prime, random_prime
+from common.rsa import make_private_key, private_power
 
 # Fast modular exponentiation
 def power(base, exp, mod):
@@ -29,40 +34,13 @@ def modinverse(e, phi):
         raise Exception("Modular inverse does not exist")
     return x % phi
 
-# Check primality (basic Miller-Rabin)
+# Check primality (small-prime trial division + Miller-Rabin, common/primes.py)
 def is_prime(n, k=5):
-    if n < 2:
-        return False
-    if n in [2, 3]:
-        return True
-    if n % 2 == 0:
-        return False
-
-    # write n-1 as 2^r * d
-    r, d = 0, n - 1
-    while d % 2 == 0:
-        r += 1
-        d //= 2
-
-    for _ in range(k):
-        a = random.randrange(2, n - 1)
-        x = power(a, d, n)
-        if x == 1 or x == n - 1:
-            continue
-        for _ in range(r - 1):
-            x = power(x, 2, n)
-            if x == n - 1:
-                break
-        else:
-            return False
-    return True
+    return is_probable_prime(n, rounds=k)
 
-# Generate prime of given bit length
+# Generate prime of exactly the given bit length (sieved search, common/primes.py)
 def generate_prime(bits=16):
-    while True:
-        p = random.getrandbits(bits)
-        if is_prime(p):
-            return p
+    return random_prime(bits)
 
 # Generate RSA keypair
 def generate_key(bits=16):
@@ -80,7 +58,8 @@ def generate_key(bits=16):
                 e = candidate
                 break
     d = modinverse(e, phi)
-    return (n, e), (n, d)
+    # Private key keeps p, q, dp, dq, qinv for CRT signing (key[0], key[1] are n, d)
+    return (n, e), make_private_key(p, q, d)
 
 # Hash function (simple SHA-256 wrapper)
 import hashlib
@@ -89,15 +68,15 @@ def hash_message(message):
 
 # Sign message with private key
 def sign_message(message, privkey):
-    n, d = privkey
+    n = privkey[0]
     hashed = hash_message(message) % n  # Take hash mod n
-    signature = power(hashed, d, n)
+    signature = private_power(hashed, privkey)
     return signature
 
 def verify_signature(message, signature, pubkey):
     n, e = pubkey
     hashed = hash_message(message) % n  # Take hash mod n
-    hashed_from_signature = power(signature, e, n)
+    hashed_from_signature = pow(signature, e, n)
     return hashed == hashed_from_signature
 
 
@@ -3,8 +3,11 @@ import random
 import threading
 import time
 import hashlib
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import pad, unpad
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.cipher_cache import cipher_context
 
 # Diffie-Hellman params (small prime for demo only)
 p = 0xFFFFFFFB
@@ -14,14 +17,13 @@ def derive_aes_key(shared_secret):
     key_bytes = shared_secret.to_bytes((shared_secret.bit_length() + 7) // 8, 'big')
     return hashlib.sha256(key_bytes).digest()[:16]  # AES-128 key
 
+# The expanded AES key is cached per session key (common/cipher_cache.py)
 def aes_encrypt(key, plaintext):
-    cipher = AES.new(key, AES.MODE_ECB)
-    ct_bytes = cipher.encrypt(pad(plaintext.encode(), AES.block_size))
+    _, ct_bytes = cipher_context("AES", key).encrypt(plaintext.encode(), mode="ECB")
     return ct_bytes
 
 def aes_decrypt(key, ciphertext):
-    cipher = AES.new(key, AES.MODE_ECB)
-    pt = unpad(cipher.decrypt(ciphertext), AES.block_size)
+    pt = cipher_context("AES", key).decrypt(b"", ciphertext, mode="ECB")
     return pt.decode()
 
 def generate_private_key(p):
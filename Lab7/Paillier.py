@@ -1,5 +1,10 @@
+import os
 import random
 import math
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.primes import is_probable_prime, random_prime
 
 # Utility functions
 
@@ -23,37 +28,12 @@ def extended_gcd(a, b):
         return (g, x - (b // a) * y, y)
 
 def get_prime(bitsize):
-    """Generate a prime number of approximately bitsize bits"""
-    while True:
-        num = random.getrandbits(bitsize)
-        # Ensure num is odd and of correct bit length
-        num |= (1 << bitsize - 1) | 1
-        if is_prime(num):
-            return num
+    """Generate a prime number of exactly bitsize bits"""
+    return random_prime(bitsize)
 
 def is_prime(n, k=10):
-    """Miller-Rabin primality test"""
-    if n < 2:
-        return False
-    for p in [2, 3, 5, 7, 11]:
-        if n % p == 0 and n != p:
-            return False
-    s, d = 0, n - 1
-    while d % 2 == 0:
-        d >>= 1
-        s += 1
-    for _ in range(k):
-        a = random.randrange(2, n - 1)
-        x = pow(a, d, n)
-        if x == 1 or x == n - 1:
-            continue
-        for __ in range(s - 1):
-            x = pow(x, 2, n)
-            if x == n - 1:
-                break
-        else:
-            return False
-    return True
+    """Miller-Rabin primality test (common/primes.py)"""
+    return is_probable_prime(n, rounds=k)
 
 # Paillier key generation, encryption, and decryption
 
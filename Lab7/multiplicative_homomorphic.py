@@ -1,5 +1,9 @@
-import random
-import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.primes import is_probable_prime, random_prime
+from common.rsa import generate_private_key, key_primes, private_power
 
 # Extended Euclidean Algorithm for modular inverse
 def extended_gcd(a, b):
@@ -17,53 +21,22 @@ def modinv(a, m):
         return x % m
 
 def is_prime(n, k=10):
-    """Miller-Rabin primality test"""
-    if n < 2:
-        return False
-    for p in [2, 3, 5, 7, 11]:
-        if n == p:
-            return True
-        if n % p == 0:
-            return False
-    s, d = 0, n - 1
-    while d % 2 == 0:
-        d >>= 1
-        s += 1
-    for _ in range(k):
-        a = random.randrange(2, n - 1)
-        x = pow(a, d, n)
-        if x == 1 or x == n - 1:
-            continue
-        for __ in range(s - 1):
-            x = pow(x, 2, n)
-            if x == n - 1:
-                break
-        else:
-            return False
-    return True
+    """Miller-Rabin primality test (common/primes.py)"""
+    return is_probable_prime(n, rounds=k)
 
 def generate_prime(bitsize):
-    while True:
-        p = random.getrandbits(bitsize)
-        p |= (1 << bitsize - 1) | 1  # Ensure high bit and oddness
-        if is_prime(p):
-            return p
+    return random_prime(bitsize)
 
 class RSA:
-    def __init__(self, bitsize=512):
-        self.p = generate_prime(bitsize // 2)
-        self.q = generate_prime(bitsize // 2)
-        self.n = self.p * self.q
-        self.phi = (self.p - 1) * (self.q - 1)
+    def __init__(self, bitsize=512, n_primes=2):
         self.e = 65537  # Common choice for e
-        # Ensure e and phi(n) are coprime
-        if math.gcd(self.e, self.phi) != 1:
-            # Find an alternative e
-            for candidate in range(3, 10000, 2):
-                if math.gcd(candidate, self.phi) == 1:
-                    self.e = candidate
-                    break
-        self.d = modinv(self.e, self.phi)
+        # Primes are drawn with gcd(e, r - 1) = 1; n_primes > 2 gives a
+        # multi-prime key with the same (n, e) public key
+        self.private_key = generate_private_key(bitsize, n_primes, self.e)
+        self.primes = key_primes(self.private_key)
+        self.p, self.q = self.primes[:2]
+        self.n = self.private_key.n
+        self.d = self.private_key.d  # e^-1 mod lcm(r - 1), the exponent decrypt uses
 
     def encrypt(self, m):
         if not (0 <= m < self.n):
@@ -71,7 +44,7 @@ class RSA:
         return pow(m, self.e, self.n)
 
     def decrypt(self, c):
-        return pow(c, self.d, self.n)
+        return private_power(c, self.private_key)  # CRT over all primes
 
 # Example usage
 rsa = RSA(bitsize=512)
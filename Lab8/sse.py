@@ -1,8 +1,11 @@
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import pad, unpad
 from Crypto.Random import get_random_bytes
 import base64
 import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.cipher_cache import cipher_context
 
 # =============================
 # 1a. Create a dataset
@@ -25,25 +28,42 @@ documents = {
 # =============================
 key = get_random_bytes(16)  # 128-bit AES key
 
-def encrypt_AES(plaintext, key):
-    cipher = AES.new(key, AES.MODE_CBC)
-    ct_bytes = cipher.encrypt(pad(plaintext.encode('utf-8'), AES.block_size))
-    iv = base64.b64encode(cipher.iv).decode('utf-8')
+# AES-CBC with a fresh IV per message; the expanded key is cached
+# (common/cipher_cache.py) instead of calling AES.new every time
+def to_json(iv, ct_bytes):
+    iv = base64.b64encode(iv).decode('utf-8')
     ct = base64.b64encode(ct_bytes).decode('utf-8')
     return json.dumps({'iv': iv, 'ciphertext': ct})
 
+def from_json(ciphertext_json):
+    b64 = json.loads(ciphertext_json)
+    return base64.b64decode(b64['iv']), base64.b64decode(b64['ciphertext'])
+
+def encrypt_AES(plaintext, key):
+    return to_json(*cipher_context("AES", key).encrypt(plaintext.encode('utf-8'), mode="CBC"))
+
 def decrypt_AES(ciphertext_json, key):
     try:
-        b64 = json.loads(ciphertext_json)
-        iv = base64.b64decode(b64['iv'])
-        ct = base64.b64decode(b64['ciphertext'])
-        cipher = AES.new(key, AES.MODE_CBC, iv)
-        pt = unpad(cipher.decrypt(ct), AES.block_size)
+        iv, ct = from_json(ciphertext_json)
+        pt = cipher_context("AES", key).decrypt(iv, ct, mode="CBC")
         return pt.decode('utf-8')
     except Exception as e:
         print("Decryption error:", e)
         return None
 
+# Batch versions: one cached context for the whole list
+def encrypt_AES_batch(plaintexts, key):
+    items = cipher_context("AES", key).encrypt_batch([p.encode('utf-8') for p in plaintexts])
+    return [to_json(iv, ct) for iv, ct in items]
+
+def decrypt_AES_batch(ciphertext_jsons, key):
+    try:
+        items = [from_json(c) for c in ciphertext_jsons]
+        return [pt.decode('utf-8') for pt in cipher_context("AES", key).decrypt_batch(items)]
+    except Exception:
+        # Redo one at a time so only the bad items become None, as in decrypt_AES
+        return [decrypt_AES(c, key) for c in ciphertext_jsons]
+
 # =============================
 # 1c. Create an inverted index
 # =============================
@@ -62,7 +82,7 @@ inverted_index = build_inverted_index(documents)
 encrypted_index = {}
 for word, doc_ids in inverted_index.items():
     encrypted_word = encrypt_AES(word, key)
-    encrypted_doc_ids = [encrypt_AES(str(did), key) for did in doc_ids]
+    encrypted_doc_ids = encrypt_AES_batch([str(did) for did in doc_ids], key)
     encrypted_index[encrypted_word] = encrypted_doc_ids
 
 # =============================
@@ -80,9 +100,8 @@ def search(query, key, encrypted_index, docs):
     for enc_word, enc_docs in encrypted_index.items():
         word = decrypt_AES(enc_word, key)
         if word == query.lower():
-            for enc_doc_id in enc_docs:
-                doc_id = int(decrypt_AES(enc_doc_id, key))
-                results.append((doc_id, docs[doc_id]))
+            for doc_id in decrypt_AES_batch(enc_docs, key):
+                results.append((int(doc_id), docs[int(doc_id)]))
     if results:
         print(" Matching Documents:")
         for doc_id, text in results:
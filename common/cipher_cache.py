@@ -0,0 +1,199 @@
+# Cached cipher contexts for repeated AES/DES/3DES operations.
+#
+# AES.new/DES3.new expand the key every time they are called, which costs
+# more than encrypting a short message. A pycryptodome mode object cannot be
+# given a new IV, but an ECB object is stateless, so the expanded key is kept
+# in one ECB object per (algorithm, key) in a bounded LRU cache and the modes
+# are built on top of it:
+#
+#   ECB - the cached object directly
+#   CBC - block-by-block chaining for encryption, one ECB call + XOR to decrypt
+#   CTR - one ECB call over the counter blocks, then XOR
+#
+# Output is identical to AES.new(key, MODE_CBC, iv=iv) with PKCS#7 padding and
+# AES.new(key, MODE_CTR, nonce=nonce) (nonce is half a block, counter from 0),
+# so either side of a protocol can use plain pycryptodome. Every encrypt call
+# draws a fresh IV/nonce. The batch functions encrypt a list of messages with
+# one context: the CTR keystreams and CBC decryptions are single ECB calls,
+# and CBC encryption makes one ECB call per block position across messages.
+
+import os
+import time
+from functools import lru_cache
+
+from Crypto.Cipher import AES, DES, DES3
+from Crypto.Util.Padding import pad, unpad
+
+ALGORITHMS = {"AES": AES, "DES": DES, "DES3": DES3}
+MODES = ("ECB", "CBC", "CTR")
+
+
+def xor_bytes(a, b):
+    n = len(a)
+    return (int.from_bytes(a, 'big') ^ int.from_bytes(b[:n], 'big')).to_bytes(n, 'big')
+
+
+class CipherContext:
+    """Expanded key for one algorithm/key; encrypt returns (iv, ciphertext)"""
+
+    def __init__(self, algorithm, key):
+        self.algorithm = algorithm
+        self.module = ALGORITHMS[algorithm]
+        self.block_size = self.module.block_size
+        self._ecb = self.module.new(key, self.module.MODE_ECB)
+
+    def _iv_size(self, mode):
+        if mode not in MODES:
+            raise ValueError(f"Unsupported mode: {mode}")
+        return {"ECB": 0, "CBC": self.block_size, "CTR": self.block_size // 2}[mode]
+
+    def _counter_blocks(self, nonce, n_blocks):
+        half = self.block_size // 2
+        return b''.join([nonce + i.to_bytes(half, 'big') for i in range(n_blocks)])
+
+    def _cbc_encrypt(self, iv, data):
+        bs, ecb = self.block_size, self._ecb
+        out, prev = [], iv
+        for i in range(0, len(data), bs):
+            prev = ecb.encrypt(xor_bytes(data[i:i + bs], prev))
+            out.append(prev)
+        return b''.join(out)
+
+    def _cbc_decrypt(self, iv, ciphertext):
+        if len(ciphertext) % self.block_size:
+            raise ValueError("Ciphertext is not a multiple of the block size")
+        chain = iv + ciphertext[:-self.block_size]
+        return xor_bytes(self._ecb.decrypt(ciphertext), chain)
+
+    def _ctr(self, nonce, data):
+        n_blocks = -(-len(data) // self.block_size)
+        return xor_bytes(data, self._ecb.encrypt(self._counter_blocks(nonce, n_blocks)))
+
+    def encrypt(self, plaintext, mode="CBC", iv=None):
+        """Encrypt one message under a fresh IV/nonce (or the one given)"""
+        size = self._iv_size(mode)
+        iv = os.urandom(size) if iv is None else iv
+        if mode == "CTR":
+            return iv, self._ctr(iv, plaintext)
+        data = pad(plaintext, self.block_size)
+        if mode == "ECB":
+            return iv, self._ecb.encrypt(data)
+        return iv, self._cbc_encrypt(iv, data)
+
+    def decrypt(self, iv, ciphertext, mode="CBC"):
+        self._iv_size(mode)
+        if mode == "CTR":
+            return self._ctr(iv, ciphertext)
+        if mode == "ECB":
+            return unpad(self._ecb.decrypt(ciphertext), self.block_size)
+        return unpad(self._cbc_decrypt(iv, ciphertext), self.block_size)
+
+    def encrypt_batch(self, messages, mode="CBC"):
+        """[(iv, ciphertext)] for a list of messages, each with a fresh IV/nonce"""
+        size, bs = self._iv_size(mode), self.block_size
+        randomness = os.urandom(size * len(messages))
+        ivs = [randomness[i * size:(i + 1) * size] for i in range(len(messages))]
+        if mode == "CTR":
+            counts = [-(-len(m) // bs) for m in messages]
+            keystream = self._ecb.encrypt(b''.join(
+                [self._counter_blocks(iv, n) for iv, n in zip(ivs, counts)]))
+            out, pos = [], 0
+            for iv, m, n in zip(ivs, messages, counts):
+                out.append((iv, xor_bytes(m, keystream[pos:pos + n * bs])))
+                pos += n * bs
+            return out
+        padded = [pad(m, bs) for m in messages]
+        if mode == "ECB":
+            data = self._ecb.encrypt(b''.join(padded))
+            return list(zip(ivs, split(data, [len(p) for p in padded])))
+        # CBC: block j of every message that has one goes through a single ECB call
+        prev = list(ivs)
+        blocks = [[] for _ in messages]
+        longest = max((len(p) for p in padded), default=0) // bs
+        for j in range(longest):
+            live = [i for i, p in enumerate(padded) if len(p) > j * bs]
+            data = self._ecb.encrypt(b''.join(
+                [xor_bytes(padded[i][j * bs:(j + 1) * bs], prev[i]) for i in live]))
+            for k, i in enumerate(live):
+                prev[i] = data[k * bs:(k + 1) * bs]
+                blocks[i].append(prev[i])
+        return [(iv, b''.join(b)) for iv, b in zip(ivs, blocks)]
+
+    def decrypt_batch(self, items, mode="CBC"):
+        """Plaintexts for a list of (iv, ciphertext)"""
+        self._iv_size(mode)
+        if mode == "CTR":
+            return [self._ctr(iv, c) for iv, c in items]
+        bs = self.block_size
+        lengths = [len(c) for _, c in items]
+        if any(n % bs for n in lengths):
+            raise ValueError("Ciphertext is not a multiple of the block size")
+        data = self._ecb.decrypt(b''.join([c for _, c in items]))
+        if mode == "CBC":
+            chain = b''.join([iv + c[:-bs] for iv, c in items if c])
+            data = xor_bytes(data, chain)
+        return [unpad(p, bs) for p in split(data, lengths)]
+
+
+def split(data, lengths):
+    out, pos = [], 0
+    for n in lengths:
+        out.append(data[pos:pos + n])
+        pos += n
+    return out
+
+
+@lru_cache(maxsize=128)
+def _cached_context(algorithm, key):
+    return CipherContext(algorithm, key)
+
+
+def cipher_context(algorithm, key):
+    """Cached CipherContext for ("AES" | "DES" | "DES3", key bytes)"""
+    return _cached_context(algorithm, bytes(key))
+
+
+def benchmark(n=100_000, size=32):
+    """Per-message AES.new vs a cached context vs the batch API"""
+    messages = [os.urandom(size) for _ in range(n)]
+    keys = {"AES": os.urandom(16), "DES3": DES3.adjust_key_parity(os.urandom(24))}
+    print(f"{n} messages of {size} bytes")
+    for algorithm, key in keys.items():
+        module = ALGORITHMS[algorithm]
+        bs = module.block_size
+        for mode in ("CBC", "CTR"):
+            if mode == "CBC":
+                def fresh(m):
+                    iv = os.urandom(bs)
+                    return iv, module.new(key, module.MODE_CBC, iv=iv).encrypt(pad(m, bs))
+            else:
+                def fresh(m):
+                    nonce = os.urandom(bs // 2)
+                    return nonce, module.new(key, module.MODE_CTR, nonce=nonce).encrypt(m)
+
+            context = cipher_context(algorithm, key)
+            timings = {}
+            start = time.perf_counter()
+            reference = [fresh(m) for m in messages]
+            timings["new per message"] = time.perf_counter() - start
+            start = time.perf_counter()
+            single = [context.encrypt(m, mode) for m in messages]
+            timings["cached context"] = time.perf_counter() - start
+            start = time.perf_counter()
+            batch = context.encrypt_batch(messages, mode)
+            timings["batch"] = time.perf_counter() - start
+
+            # Every output must decrypt with plain pycryptodome
+            for (iv, c), m in ((reference[0], messages[0]), (single[0], messages[0]),
+                               (batch[-1], messages[-1])):
+                check = (unpad(module.new(key, module.MODE_CBC, iv=iv).decrypt(c), bs)
+                         if mode == "CBC" else module.new(key, module.MODE_CTR, nonce=iv).decrypt(c))
+                assert check == m
+            base = timings["new per message"]
+            for label, t in timings.items():
+                print(f"{algorithm:<4} {mode}  {label:<16} {t:6.3f}s  {n / t:10.0f} msg/s  "
+                      f"{base / t:5.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,123 @@
+# Fixed-base exponentiation for a generator g mod p.
+#
+# Diffie-Hellman and ElGamal raise the same g to a fresh random exponent for
+# every key and every encryption. With the base fixed, the powers
+#
+#   table[i][d] = g^(d * 2^(w*i)) mod p      d = 1 .. 2^w - 1
+#
+# can be computed once per group (fixed-window method). g^e is then the
+# product of one table entry per nonzero w-bit digit of e: about bits / w
+# multiplications and no squarings, against ~bits squarings for pow.
+#
+# Tables are built for exponents up to p.bit_length() bits (larger ones are
+# reduced mod p - 1, p prime) and saved under CACHE_DIR, one file per
+# (g, p, window), so a group is only precomputed once per machine. Each file
+# starts with a SHA-256 of (p, g, window, bits) and the table bytes; a file
+# that does not match is rebuilt. Groups below MIN_BITS gain nothing over
+# pow and skip the table.
+
+import hashlib
+import os
+from functools import lru_cache
+
+WINDOW = 6
+MIN_BITS = 256
+DIGEST_SIZE = 32
+CACHE_DIR = os.environ.get(
+    "FIXED_BASE_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "crypto-labs", "fixed_base"),
+)
+
+
+class FixedBase:
+    """Precomputed powers of g mod p; pow(e) == builtin pow(g, e, p)"""
+
+    def __init__(self, g, p, window=WINDOW, cache_dir=CACHE_DIR):
+        self.g = g % p
+        self.p = p
+        self.window = window
+        self.bits = p.bit_length()
+        self.table = None
+        if self.bits >= MIN_BITS:
+            self.table = self._load(cache_dir) or self._build(cache_dir)
+
+    def _path(self, cache_dir):
+        tag = hashlib.sha256(f"{self.g}:{self.p}:{self.window}".encode()).hexdigest()[:32]
+        return os.path.join(cache_dir, f"{tag}.bin")
+
+    def _n_windows(self):
+        return -(-self.bits // self.window)
+
+    def _build(self, cache_dir):
+        p, size = self.p, (1 << self.window) - 1
+        table, base = [], self.g
+        for _ in range(self._n_windows()):
+            row, acc = [None], 1
+            for _ in range(size):
+                acc = acc * base % p
+                row.append(acc)
+            table.append(row)
+            base = acc * base % p                   # g^(2^(w*(i+1)))
+        if cache_dir:
+            self._save(cache_dir, table)
+        return table
+
+    def _digest(self, data):
+        params = f"{self.p}:{self.g}:{self.window}:{self.bits}:".encode()
+        return hashlib.sha256(params + data).digest()
+
+    def _save(self, cache_dir, table):
+        width = (self.bits + 7) // 8
+        path = self._path(cache_dir)
+        data = b"".join(v.to_bytes(width, "big") for row in table for v in row[1:])
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(self._digest(data))
+                f.write(data)
+            os.replace(tmp, path)                   # readers never see a partial file
+        except OSError:
+            pass                                    # read-only home: keep the table in memory
+
+    def _load(self, cache_dir):
+        if not cache_dir:
+            return None
+        width, size = (self.bits + 7) // 8, (1 << self.window) - 1
+        try:
+            with open(self._path(cache_dir), "rb") as f:
+                digest, data = f.read(DIGEST_SIZE), f.read()
+        except OSError:
+            return None
+        if len(data) != self._n_windows() * size * width or digest != self._digest(data):
+            return None                             # stale or corrupt: rebuild
+        row_bytes = size * width
+        table = []
+        for i in range(0, len(data), row_bytes):
+            row = [None]
+            for j in range(i, i + row_bytes, width):
+                row.append(int.from_bytes(data[j:j + width], "big"))
+            table.append(row)
+        return table
+
+    def pow(self, e):
+        if self.table is None or e < 0:
+            return pow(self.g, e, self.p)
+        if e.bit_length() > self.bits:
+            e %= self.p - 1
+        p, w, mask = self.p, self.window, (1 << self.window) - 1
+        result = 1
+        for row in self.table:
+            d = e & mask
+            if d:
+                result = result * row[d] % p
+            e >>= w
+            if not e:
+                break
+        return result
+
+
+@lru_cache(maxsize=16)
+def fixed_base(g, p):
+    """Shared FixedBase for a group, built or loaded once per process"""
+    return FixedBase(g, p)
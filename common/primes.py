@@ -0,0 +1,127 @@
+# Prime generation shared by the RSA, Rabin, Paillier and ElGamal labs.
+#
+# A random odd start with the top bit set is followed by a window of odd
+# candidates start, start + 2, ... Each candidate divisible by a prime in a
+# precomputed small-prime table is struck out of the window with one slice
+# assignment per small prime. Only the survivors (roughly 1 in 10 at 2^16)
+# reach Miller-Rabin. The residues start % p are computed once per start and
+# then advanced by the window length when the search moves on, so the big
+# number is never reduced again.
+#
+# Miller-Rabin runs base 2 first (it rejects nearly every composite that
+# survives the sieve). Below 3.3e24 the first 13 prime bases are a
+# deterministic test; above that, random bases are used, with the round
+# counts for random candidates (error below 2^-80).
+
+import bisect
+import random
+
+SIEVE_LIMIT = 1 << 16
+DETERMINISTIC_LIMIT = 3317044064679887385961981
+DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+# (minimum bits, rounds) for random candidates, largest first
+MR_ROUNDS = ((1300, 2), (850, 3), (650, 4), (550, 5), (450, 6), (400, 7),
+             (350, 8), (300, 9), (250, 12), (200, 15), (150, 18), (0, 27))
+
+_system_random = random.SystemRandom()
+
+
+def sieve_primes(limit):
+    """All primes below limit (sieve of Eratosthenes)"""
+    flags = bytearray([1]) * limit
+    flags[:2] = b'\x00\x00'
+    for i in range(2, int(limit ** 0.5) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i, f in enumerate(flags) if f]
+
+
+SMALL_PRIMES = sieve_primes(SIEVE_LIMIT)
+ODD_PRIMES = SMALL_PRIMES[1:]
+HALVES = [(p + 1) // 2 for p in ODD_PRIMES]  # inverse of 2 mod p
+
+
+def miller_rabin(n, a, d, s):
+    x = pow(a, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+
+def mr_rounds(bits):
+    for min_bits, rounds in MR_ROUNDS:
+        if bits >= min_bits:
+            return rounds
+
+
+def is_probable_prime(n, rounds=None, rng=None):
+    """Trial division by the small-prime table, then Miller-Rabin"""
+    if n < 2:
+        return False
+    if n < SIEVE_LIMIT:
+        i = bisect.bisect_left(SMALL_PRIMES, n)
+        return i < len(SMALL_PRIMES) and SMALL_PRIMES[i] == n
+    for p in SMALL_PRIMES[:64]:
+        if n % p == 0:
+            return False
+    return _miller_rabin_test(n, rounds, rng)
+
+
+def _miller_rabin_test(n, rounds=None, rng=None):
+    d, s = n - 1, 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+    if n < DETERMINISTIC_LIMIT:
+        return all(miller_rabin(n, a, d, s) for a in DETERMINISTIC_BASES)
+    if not miller_rabin(n, 2, d, s):
+        return False
+    rng = rng or _system_random
+    rounds = mr_rounds(n.bit_length()) if rounds is None else rounds
+    return all(miller_rabin(n, rng.randrange(3, n - 1), d, s) for _ in range(rounds))
+
+
+def _window_survivors(residues, n_odd):
+    """Offsets k (candidate = start + 2k) not divisible by any small prime"""
+    flags = bytearray([1]) * n_odd
+    for p, half, r in zip(ODD_PRIMES, HALVES, residues):
+        k = (p - r) * half % p  # first k with start + 2k = 0 mod p
+        if k < n_odd:
+            flags[k::p] = bytes((n_odd - 1 - k) // p + 1)
+    k = flags.find(1)
+    while k >= 0:
+        yield k
+        k = flags.find(1, k + 1)
+
+
+def random_prime(bits, rng=None):
+    """A random prime of exactly `bits` bits (top bit set)"""
+    if bits < 2:
+        raise ValueError("bits must be at least 2")
+    rng = rng or _system_random
+    if bits < 32:
+        # Candidates would be in the small-prime table; test directly
+        while True:
+            n = rng.getrandbits(bits) | 1 << (bits - 1) | 1
+            if is_probable_prime(n, rng=rng):
+                return n
+
+    n_odd = max(256, 2 * bits)  # about 3 expected primes per window
+    limit = 1 << bits
+    while True:
+        start = rng.getrandbits(bits) | 1 << (bits - 1) | 1
+        residues = [start % p for p in ODD_PRIMES]
+        while start + 2 * n_odd < limit:
+            for k in _window_survivors(residues, n_odd):
+                candidate = start + 2 * k
+                if _miller_rabin_test(candidate, rng=rng):
+                    return candidate
+            # Next window: advance the residues instead of reducing start again
+            step = 2 * n_odd
+            start += step
+            residues = [(r + step) % p for r, p in zip(residues, ODD_PRIMES)]
+        # Ran into 2^bits: draw a new start
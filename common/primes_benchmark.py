@@ -0,0 +1,81 @@
+# Prime generation timings: common/primes.random_prime against the
+# generators it replaced (a fresh random odd candidate with the top bit set
+# and 10 random-base Miller-Rabin rounds on every one, as in Lab4/q2 and Lab7).
+#
+# The old approach needs a full 4096-bit modular exponentiation for nearly
+# every odd candidate, so by default it only runs up to 2048 bits.
+#
+# Usage:
+#   python -m common.primes_benchmark
+#   python -m common.primes_benchmark --bits 512 1024 2048 4096 --baseline-max 4096
+
+import argparse
+import random
+import statistics
+import time
+
+from common.primes import random_prime
+
+
+def baseline_is_prime(n, k=10):
+    if n < 2:
+        return False
+    if n in (2, 3):
+        return True
+    if n % 2 == 0:
+        return False
+    r, d = 0, n - 1
+    while d % 2 == 0:
+        r += 1
+        d //= 2
+    for _ in range(k):
+        a = random.randrange(2, n - 1)
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def baseline_prime(bits):
+    while True:
+        candidate = random.getrandbits(bits) | 1 | (1 << (bits - 1))
+        if baseline_is_prime(candidate):
+            return candidate
+
+
+def timed(func, bits, samples):
+    times = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        p = func(bits)
+        times.append(time.perf_counter() - start)
+        assert p.bit_length() == bits
+    return statistics.median(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark prime generation")
+    parser.add_argument("--bits", nargs="+", type=int, default=[512, 1024, 2048, 4096])
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--baseline-max", type=int, default=2048)
+    args = parser.parse_args(argv)
+
+    for bits in args.bits:
+        # Fewer samples for the big sizes keeps a run in minutes
+        samples = args.samples if bits <= 1024 else max(1, args.samples // 2)
+        new = timed(random_prime, bits, samples)
+        line = f"{bits:5d}-bit  sieved {new * 1e3:10.1f} ms"
+        if bits <= args.baseline_max:
+            old = timed(baseline_prime, bits, samples)
+            line += f"  baseline {old * 1e3:10.1f} ms  {old / new:5.1f}x"
+        print(line + f"  (median of {samples})")
+
+
+if __name__ == "__main__":
+    main()
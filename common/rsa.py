@@ -0,0 +1,120 @@
+# RSA private-key operations with the Chinese Remainder Theorem.
+#
+# The private key carries the factors so c^d mod n is computed as two
+# half-size exponentiations, c^dp mod p and c^dq mod q (Garner recombination
+# with qinv = q^-1 mod p), using the builtin three-argument pow. Element 0
+# and 1 of the key are still n and d, so code that indexes a plain (n, d)
+# tuple keeps working, and private_power accepts either form.
+#
+# Multi-prime keys (PKCS#1 v2.2) add (r, d mod (r - 1), t) triples for the
+# third and later primes, with t the inverse of the product of the earlier
+# primes mod r. A k-prime private operation is k exponentiations on 1/k-size
+# numbers, and keygen searches for k smaller primes. The public key is still
+# an ordinary (n, e).
+
+import math
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from common.primes import random_prime
+
+RSAPrivateKey = namedtuple('RSAPrivateKey', 'n d p q dp dq qinv others', defaults=((),))
+
+MAX_PRIMES = 4
+MAX_DRAWS = 100  # prime draws per step before generate_private_key starts over
+MIN_PARALLEL_CHUNKS = 64  # below this a process pool costs more than it saves
+
+
+def make_private_key(p, q, d):
+    """RSAPrivateKey for distinct primes p, q and private exponent d"""
+    return RSAPrivateKey(p * q, d, p, q, d % (p - 1), d % (q - 1), pow(q, -1, p))
+
+
+def make_multiprime_key(primes, d):
+    """RSAPrivateKey for 2-4 distinct primes (the first two become p and q)"""
+    if not 2 <= len(primes) <= MAX_PRIMES:
+        raise ValueError(f"Need 2 to {MAX_PRIMES} primes")
+    p, q, *rest = primes
+    key = make_private_key(p, q, d)
+    others, product = [], p * q
+    for r in rest:
+        others.append((r, d % (r - 1), pow(product, -1, r)))
+        product *= r
+    return key._replace(n=product, others=tuple(others))
+
+
+def key_primes(key):
+    return (key.p, key.q) + tuple(r for r, _, _ in key.others)
+
+
+def _draw_primes(bits, n_primes, e):
+    """n_primes distinct primes with gcd(e, r - 1) = 1 whose product has
+    exactly `bits` bits, or None if this attempt should start over"""
+    def next_prime(size, taken):
+        for _ in range(MAX_DRAWS):
+            r = random_prime(size)
+            if r not in taken and math.gcd(e, r - 1) == 1:
+                return r
+        return None
+
+    primes = []
+    for _ in range(n_primes - 1):
+        r = next_prime(bits // n_primes, primes)
+        if r is None:
+            return None
+        primes.append(r)
+    product = math.prod(primes)
+    # Size the last prime so the modulus starts at bit `bits`; only it is
+    # redrawn, and only MAX_DRAWS times (if the others' product sits near the
+    # top of its bit length no last prime of this size may fit)
+    size = bits - product.bit_length() + 1
+    if size < 2:
+        return None
+    for _ in range(MAX_DRAWS):
+        last = next_prime(size, primes)
+        if last is not None and (product * last).bit_length() == bits:
+            return primes + [last]
+    return None
+
+
+def generate_private_key(bits, n_primes=2, e=65537):
+    """RSAPrivateKey with an exactly `bits`-bit modulus of n_primes distinct
+    primes, each with gcd(e, r - 1) = 1"""
+    for _ in range(MAX_DRAWS):
+        primes = _draw_primes(bits, n_primes, e)
+        if primes is not None:
+            lam = math.lcm(*(r - 1 for r in primes))
+            return make_multiprime_key(primes, pow(e, -1, lam))
+    raise ValueError(f"No {n_primes} distinct primes found for a {bits}-bit modulus")
+
+
+def private_power(c, key):
+    """c^d mod n, through the CRT when the key has its factors"""
+    if not isinstance(key, RSAPrivateKey):
+        n, d = key
+        return pow(c, d, n)
+    m1 = pow(c, key.dp, key.p)
+    m2 = pow(c, key.dq, key.q)
+    m = m2 + (m1 - m2) * key.qinv % key.p * key.q
+    product = key.p * key.q
+    for r, dr, t in key.others:
+        mr = pow(c, dr, r)
+        m += (mr - m) * t % r * product
+        product *= r
+    return m
+
+
+def _private_power_slice(args):
+    values, key = args
+    return [private_power(c, key) for c in values]
+
+
+def private_power_batch(values, key, workers=None):
+    """private_power over a list; large lists are split across processes"""
+    values = list(values)
+    if not workers or workers < 2 or len(values) < MIN_PARALLEL_CHUNKS:
+        return _private_power_slice((values, key))
+    step = -(-len(values) // workers)
+    jobs = [(values[i:i + step], key) for i in range(0, len(values), step)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [m for part in pool.map(_private_power_slice, jobs) for m in part]